@@ -0,0 +1,288 @@
+"""
+analytics.py
+------------
+Write-behind visit analytics.
+
+Page views are counted in memory and flushed to SQLite in batches, either
+every FLUSH_INTERVAL seconds or as soon as FLUSH_THRESHOLD visits are
+pending, whichever comes first. Each flush
+  - adds the pending delta to the lifetime ``visits`` counter, and
+  - bulk-upserts per-minute buckets, already rolled up to hour and day,
+    into ``visit_buckets`` with path and referrer-host dimensions.
+
+Both dimensions come from clients, so they are bounded: paths other than
+the frontend's routes (KNOWN_PATHS) are counted as "other", and a bucket
+keeps at most MAX_REFERRERS referrer hosts, later ones going to "other".
+
+Range queries read those rollups directly and never scan raw events; they
+are async and go through the aiosqlite pool.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from database import async_connection, get_connection
+
+FLUSH_INTERVAL = 2.0          # Seconds between background flushes
+FLUSH_THRESHOLD = 500         # Pending visits that trigger an early flush
+
+GRANULARITIES = {"minute": 60, "hour": 3600, "day": 86400}
+RETENTION = {"minute": 2 * 86400, "hour": 90 * 86400, "day": 2 * 365 * 86400}
+PRUNE_INTERVAL = 3600.0       # Seconds between retention sweeps
+MAX_POINTS = 5000             # Largest series a range query may return
+MAX_DIMENSION_LENGTH = 200    # Longer referrer hosts are truncated
+MAX_REFERRERS = 20            # Distinct referrer hosts per bucket
+KNOWN_PATHS = frozenset({"/", "/snake"})    # Routes of frontend/src/App.tsx
+OTHER = "other"
+TOP_N = 10                    # Paths / referrers listed per range query
+
+log = logging.getLogger(__name__)
+
+# A referrer host the bucket has not seen is stored as "other" once the
+# bucket already has MAX_REFERRERS of them ("" for direct visits is free)
+_UPSERT_BUCKET = (
+    "INSERT INTO visit_buckets (granularity, bucket_start, path, referrer, count) "
+    "SELECT :granularity, :start, :path, "
+    "CASE WHEN :referrer IN ('', :other) OR EXISTS ("
+    "  SELECT 1 FROM visit_buckets WHERE granularity = :granularity "
+    "  AND bucket_start = :start AND referrer = :referrer"
+    ") OR ("
+    "  SELECT COUNT(DISTINCT referrer) FROM visit_buckets WHERE granularity = :granularity "
+    "  AND bucket_start = :start AND referrer NOT IN ('', :other)"
+    ") < :max_referrers THEN :referrer ELSE :other END, :count "
+    "WHERE true "     # Lets SQLite parse the upsert clause after a SELECT
+    "ON CONFLICT (granularity, bucket_start, path, referrer) "
+    "DO UPDATE SET count = count + excluded.count"
+)
+
+
+def _clean_path(path) -> str:
+    """One of KNOWN_PATHS, "" when none was sent, or "other"."""
+    if not path:
+        return ""
+    path = path.split("?", 1)[0].split("#", 1)[0]
+    path = path.rstrip("/") or "/"
+    return path if path in KNOWN_PATHS else OTHER
+
+
+def _clean_referrer(referrer) -> str:
+    """Reduce a referrer URL to its host to keep the dimension small."""
+    if not referrer:
+        return ""
+    host = urlsplit(referrer).netloc or referrer
+    return host.lower()[:MAX_DIMENSION_LENGTH]
+
+
+class VisitCounter:
+    """
+    In-process visit counter with batched persistence.
+
+    ``total()`` is always ``persisted + pending``: the last count read back
+    from SQLite plus the visits this process has not flushed yet, so reads
+    never go backwards while a flush is in progress.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, flush_threshold=FLUSH_THRESHOLD):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._persisted = 0
+        self._pending = 0
+        self._buckets = Counter()       # (minute_start, path, referrer) -> visits
+        self._last_prune = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── Hot path ────────────────────────────────────────────────────────
+
+    def increment(self, n: int = 1, path: str = "", referrer: str = "") -> int:
+        """Record ``n`` visits and return the new total."""
+        key = (int(time.time()) // 60 * 60, _clean_path(path), _clean_referrer(referrer))
+        with self._lock:
+            self._pending += n
+            self._buckets[key] += n
+            total = self._persisted + self._pending
+            due = self._pending >= self.flush_threshold
+        if due:
+            self._wake.set()
+        return total
+
+    def total(self) -> int:
+        with self._lock:
+            return self._persisted + self._pending
+
+    # ── Persistence ─────────────────────────────────────────────────────
+
+    def load(self):
+        """Read the persisted count from SQLite."""
+        with get_connection() as conn:
+            row = conn.execute("SELECT count FROM visits WHERE id = 1").fetchone()
+        with self._lock:
+            self._persisted = row["count"] if row else 0
+
+    def flush(self):
+        """Write pending visits and their bucket rollups in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                delta = self._pending
+                buckets, self._buckets = self._buckets, Counter()
+            if not delta:
+                # Nothing to write, but other worker processes may have
+                # flushed: pick up their visits so totals do not go stale
+                self.load()
+                return
+            try:
+                with get_connection() as conn:
+                    conn.execute("UPDATE visits SET count = count + ? WHERE id = 1", (delta,))
+                    conn.executemany(_UPSERT_BUCKET, _rollup(buckets))
+                    row = conn.execute("SELECT count FROM visits WHERE id = 1").fetchone()
+                    if time.monotonic() - self._last_prune > PRUNE_INTERVAL:
+                        _prune(conn)
+                        self._last_prune = time.monotonic()
+            except BaseException:
+                with self._lock:
+                    self._buckets.update(buckets)
+                raise
+            with self._lock:
+                self._pending -= delta
+                self._persisted = row["count"]
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self):
+        """Load the persisted count and start the background flusher."""
+        self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="visit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write out everything still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Visit flush failed; will retry")
+
+
+def _rollup(minute_buckets: Counter):
+    """Expand minute buckets into minute, hour and day upsert rows."""
+    rolled = Counter()
+    for (minute, path, referrer), count in minute_buckets.items():
+        for granularity, width in GRANULARITIES.items():
+            rolled[(granularity, minute // width * width, path, referrer)] += count
+    return [
+        {
+            "granularity": granularity, "start": start, "path": path, "referrer": referrer,
+            "count": count, "other": OTHER, "max_referrers": MAX_REFERRERS,
+        }
+        for (granularity, start, path, referrer), count in rolled.items()
+    ]
+
+
+def _prune(conn):
+    now = int(time.time())
+    for granularity, keep in RETENTION.items():
+        conn.execute(
+            "DELETE FROM visit_buckets WHERE granularity = ? AND bucket_start < ?",
+            (granularity, now - keep),
+        )
+
+
+visits = VisitCounter()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Range queries
+# ═══════════════════════════════════════════════════════════════════════════
+
+MAX_TIMESTAMP = 253402300799     # 9999-12-31T23:59:59Z, the last instant datetime handles
+
+
+def parse_timestamp(value: str) -> int:
+    """
+    Parse Unix seconds or an ISO 8601 date/datetime (naive = UTC). Raises
+    ValueError on bad input, including instants before 1970 or after 9999.
+    """
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        ts = int(value)
+    else:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            ts = int(parsed.timestamp())
+        except (OverflowError, OSError) as exc:
+            raise ValueError(f"Timestamp out of range: {value}") from exc
+    if not 0 <= ts <= MAX_TIMESTAMP:
+        raise ValueError(f"Timestamp out of range: {value}")
+    return ts
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+async def query_range(start: int, end: int, granularity: str = "hour") -> dict:
+    """
+    Visit series between ``start`` (inclusive) and ``end`` (exclusive),
+    read from the precomputed ``granularity`` rollup, plus the top paths and
+    referrers over the same buckets. Raises ValueError on a bad range.
+
+    Visits still buffered in a worker's memory are not included, so the
+    series lags the live total by up to FLUSH_INTERVAL (about 2 seconds).
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    width = GRANULARITIES[granularity]
+    start = start // width * width
+    if end <= start:
+        raise ValueError("'to' must be later than 'from'")
+    if (end - start) // width > MAX_POINTS:
+        raise ValueError(f"Range spans more than {MAX_POINTS} {granularity} buckets")
+
+    where = "granularity = ? AND bucket_start >= ? AND bucket_start < ?"
+    params = (granularity, start, end)
+    async with async_connection() as conn:
+        series = await conn.execute_fetchall(
+            f"SELECT bucket_start, SUM(count) AS count FROM visit_buckets WHERE {where} "
+            "GROUP BY bucket_start ORDER BY bucket_start",
+            params,
+        )
+        paths = await conn.execute_fetchall(
+            f"SELECT path, SUM(count) AS count FROM visit_buckets WHERE {where} "
+            "GROUP BY path ORDER BY count DESC LIMIT ?",
+            (*params, TOP_N),
+        )
+        referrers = await conn.execute_fetchall(
+            f"SELECT referrer, SUM(count) AS count FROM visit_buckets WHERE {where} "
+            "GROUP BY referrer ORDER BY count DESC LIMIT ?",
+            (*params, TOP_N),
+        )
+
+    return {
+        "from": _iso(start),
+        "to": _iso(end),
+        "granularity": granularity,
+        "visits": sum(r["count"] for r in series),
+        "series": [{"start": _iso(r["bucket_start"]), "count": r["count"]} for r in series],
+        "top_paths": [{"path": r["path"], "count": r["count"]} for r in paths],
+        "top_referrers": [{"referrer": r["referrer"], "count": r["count"]} for r in referrers],
+    }
@@ -0,0 +1,375 @@
+"""
+bench_api.py
+------------
+Reproducible throughput and latency benchmark for the whole API.
+
+The app runs in-process behind an httpx ASGI client, with its startup and
+shutdown hooks, on a throwaway SQLite database and model directory, so a
+run never touches backend/portfolio.db and starts from the same seeded
+data every time. It covers
+
+  - every route in main.py, one scenario each (chatbot routes replay the
+    query corpus in chat_queries.txt)
+  - chatbot.get_answer() called directly, with and without the answer cache
+  - a mixed scenario: content reads interleaved with visit and contact
+    writes, which exercises the write-behind queues under read load
+
+and reports throughput and p50 / p95 / p99 latency per scenario. Each
+scenario runs --rounds times and the round with the median throughput is
+kept, which steadies the numbers on a busy machine. Client
+and server share one event loop and one process, so absolute numbers
+include client overhead and no network; compare runs of this script with
+each other, not with a deployed server.
+
+Usage (from backend/):
+    python benchmarks/bench_api.py [--requests 300] [--concurrency 8] [--rounds 3]
+                                   [--only chatbot] [--output results.json]
+    python benchmarks/compare_results.py base.json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chat_queries.txt")
+sys.path.insert(0, BACKEND_DIR)
+
+SEED = 20240101
+BATCH_SIZE = 100              # Queries per /api/chatbot/batch request
+
+# Share of each operation in the mixed read/write scenario
+MIX = (
+    ("read content", 0.60),
+    ("record visit", 0.25),
+    ("submit contact", 0.10),
+    ("read analytics", 0.05),
+)
+
+
+def load_corpus() -> list:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+# ── Measurement ─────────────────────────────────────────────────────────────
+
+def _percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def summarize(latencies: list, seconds: float, statuses=None) -> dict:
+    ordered = sorted(latencies)
+    result = {
+        "requests": len(ordered),
+        "seconds": round(seconds, 4),
+        "throughput_rps": round(len(ordered) / seconds, 1) if seconds else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95": round(_percentile(ordered, 0.95) * 1000, 3),
+            "p99": round(_percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+    }
+    if statuses is not None:
+        result["status"] = {str(code): count for code, count in sorted(statuses.items())}
+    return result
+
+
+async def drive(op, requests: int, concurrency: int, warmup: int) -> dict:
+    """
+    Call ``op(i)`` for i in range(requests) from ``concurrency`` tasks after
+    ``warmup`` untimed calls. ``op`` returns (operation label, status code);
+    with more than one label the result is also broken down per label.
+    """
+    for i in range(warmup):
+        await op(-1 - i)
+
+    latencies, statuses = [], Counter()
+    by_label = defaultdict(list)
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            label, status = await op(i)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            by_label[label].append(elapsed)
+            statuses[status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, time.perf_counter() - start, statuses)
+    if len(by_label) > 1:
+        result["by_operation"] = {
+            label: summarize(times, sum(times)) for label, times in sorted(by_label.items())
+        }
+        for breakdown in result["by_operation"].values():
+            del breakdown["seconds"], breakdown["throughput_rps"]
+    return result
+
+
+def median_round(rounds: list) -> dict:
+    """The round with the median throughput, plus every round's throughput."""
+    ordered = sorted(rounds, key=lambda r: r["throughput_rps"])
+    return {**ordered[len(ordered) // 2], "rounds_rps": [r["throughput_rps"] for r in rounds]}
+
+
+# ── Scenarios ───────────────────────────────────────────────────────────────
+
+def http_scenarios(client, corpus: list) -> list:
+    """
+    (name, op, request cap) for every route and the mixed read/write
+    scenario, in run order. Ops take the request number
+    and return (label, status); caps keep slow or state-growing scenarios
+    (full exports, knowledge writes that trigger refits) short.
+    """
+    state = {"etag": None, "created": []}
+    last_day = {"to": str(int(time.time())), "granularity": "hour"}
+
+    def call(method, path, **kwargs):
+        async def op(i):
+            response = await client.request(method, path, **kwargs)
+            return None, response.status_code
+        return op
+
+    def chat(path, **extra):
+        async def op(i):
+            body = {"query": corpus[i % len(corpus)], **extra}
+            response = await client.post(path, json=body)
+            return None, response.status_code
+        return op
+
+    async def batch(i):
+        start = (i * BATCH_SIZE) % len(corpus)
+        queries = [corpus[(start + j) % len(corpus)] for j in range(BATCH_SIZE)]
+        response = await client.post("/api/chatbot/batch", json={"queries": queries})
+        return None, response.status_code
+
+    async def projects_not_modified(i):
+        if state["etag"] is None:
+            state["etag"] = (await client.get("/api/projects")).headers["etag"]
+        response = await client.get("/api/projects", headers={"If-None-Match": state["etag"]})
+        return None, response.status_code
+
+    async def contact(i):
+        response = await client.post("/api/contact", json={
+            "name": f"Bench {i}",
+            "email": f"bench{i}@example.com",
+            "message": "Benchmark message " * 8,
+        })
+        return None, response.status_code
+
+    async def create_knowledge(i):
+        response = await client.post("/api/knowledge", json={
+            "label": f"Benchmark entry {i}",
+            "keywords": "benchmark load test",
+            "content": f"Benchmark entry number {i}, created by bench_api.py.",
+        })
+        if response.status_code == 201:
+            state["created"].append(response.json()["id"])
+        return None, response.status_code
+
+    async def patch_knowledge(i):
+        entry_ids = state["created"] or [1]
+        entry_id = entry_ids[i % len(entry_ids)]
+        response = await client.patch(
+            f"/api/knowledge/{entry_id}", json={"keywords": f"benchmark edit {i % 7}"}
+        )
+        return None, response.status_code
+
+    async def delete_knowledge(i):
+        if not state["created"]:
+            return None, 0
+        response = await client.delete(f"/api/knowledge/{state['created'].pop()}")
+        return None, response.status_code
+
+    return [
+        ("GET /api/projects", call("GET", "/api/projects"), None),
+        ("GET /api/projects (304)", projects_not_modified, None),
+        ("GET /api/experience", call("GET", "/api/experience"), None),
+        ("GET /api/skills", call("GET", "/api/skills"), None),
+        ("POST /api/contact", contact, None),
+        ("GET /api/contacts", call("GET", "/api/contacts", params={"limit": 50}), None),
+        ("GET /api/contacts (ndjson)", call("GET", "/api/contacts", params={"format": "ndjson"}), 50),
+        ("GET /api/contacts/metrics", call("GET", "/api/contacts/metrics"), None),
+        ("POST /api/chatbot", chat("/api/chatbot"), None),
+        ("POST /api/chatbot (compose)", chat("/api/chatbot", compose=True), None),
+        ("POST /api/chatbot/stream", chat("/api/chatbot/stream"), None),
+        ("POST /api/chatbot/batch", batch, 50),
+        ("GET /api/chatbot/cache", call("GET", "/api/chatbot/cache"), None),
+        ("GET /api/analytics", call("GET", "/api/analytics"), None),
+        ("GET /api/analytics (range)", call("GET", "/api/analytics", params=last_day), None),
+        ("POST /api/analytics/visit", call("POST", "/api/analytics/visit", json={"path": "/"}), None),
+        ("POST /api/bootstrap", call("POST", "/api/bootstrap", json={"path": "/"}), None),
+        ("GET /metrics", call("GET", "/metrics"), None),
+        ("GET /api/knowledge", call("GET", "/api/knowledge"), None),
+        ("GET /api/knowledge/{id}", call("GET", "/api/knowledge/1"), None),
+        ("mixed read/write", mixed_scenario(client, last_day), None),
+        # Writes last: each one updates the chatbot and queues a background refit
+        ("POST /api/knowledge", create_knowledge, 30),
+        ("PATCH /api/knowledge/{id}", patch_knowledge, 30),
+        ("DELETE /api/knowledge/{id}", delete_knowledge, 30),
+    ]
+
+
+def mixed_scenario(client, analytics_params: dict):
+    rng = random.Random(SEED)
+    labels = [label for label, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    content_paths = ("/api/projects", "/api/experience", "/api/skills")
+
+    async def op(i):
+        label = rng.choices(labels, weights)[0]
+        if label == "read content":
+            response = await client.get(content_paths[i % len(content_paths)])
+        elif label == "record visit":
+            response = await client.post("/api/analytics/visit", json={"path": f"/page/{i % 20}"})
+        elif label == "submit contact":
+            response = await client.post("/api/contact", json={
+                "name": f"Mixed {i}", "email": f"mixed{i}@example.com", "message": "Hello!",
+            })
+        else:
+            response = await client.get("/api/analytics", params=analytics_params)
+        return label, response.status_code
+
+    return op
+
+
+def bench_engine(corpus: list, requests: int, cached: bool) -> dict:
+    """chatbot.get_answer() on the corpus, clearing the answer cache before every call unless ``cached``."""
+    import chatbot
+
+    chatbot.get_answers(corpus)     # Warm the model and, for the cached run, the cache
+    latencies = []
+    start = time.perf_counter()
+    for i in range(requests):
+        if not cached:
+            chatbot.clear_cache()
+        query = corpus[i % len(corpus)]
+        t = time.perf_counter()
+        chatbot.get_answer(query)
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+# ── Run ─────────────────────────────────────────────────────────────────────
+
+def _git(*args) -> str:
+    try:
+        out = subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True)
+    except OSError:
+        return ""
+    return out.stdout.strip() if out.returncode == 0 else ""
+
+
+def environment() -> dict:
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+
+    import chatbot
+    import main
+
+    corpus = load_corpus()
+    wanted = [name.lower() for name in args.only or []]
+
+    def selected(name):
+        return not wanted or any(w in name.lower() for w in wanted)
+
+    scenarios = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        chatbot.get_model()         # Finish the startup warm-up before timing anything
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     headers={"X-Admin-Token": main.ADMIN_TOKEN}) as client:
+            for name, op, cap in http_scenarios(client, corpus):
+                if selected(name):
+                    requests = min(args.requests, cap or args.requests)
+                    scenarios[name] = median_round([
+                        await drive(op, requests, args.concurrency, warmup=min(10, requests))
+                        for _ in range(args.rounds)
+                    ])
+                    _report(name, scenarios[name])
+
+        for name, cached in (("chatbot.get_answer (cached)", True),
+                             ("chatbot.get_answer (uncached)", False)):
+            if selected(name):
+                scenarios[name] = median_round([
+                    bench_engine(corpus, args.requests, cached) for _ in range(args.rounds)
+                ])
+                _report(name, scenarios[name])
+
+    return {
+        "environment": environment(),
+        "parameters": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "rounds": args.rounds,
+            "corpus_queries": len(corpus),
+            "seed": SEED,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _report(name: str, result: dict):
+    latency = result["latency_ms"]
+    errors = sum(n for code, n in result.get("status", {}).items() if not code.startswith(("2", "3")))
+    print(f"{name:<34}{result['throughput_rps']:>10.1f}{latency['p50']:>10.2f}"
+          f"{latency['p95']:>10.2f}{latency['p99']:>10.2f}{errors:>8}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=300, help="timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent client tasks")
+    parser.add_argument("--rounds", type=int, default=3, help="runs per scenario; the median is kept")
+    parser.add_argument("--only", nargs="+", metavar="TEXT",
+                        help="run the scenarios whose name contains any of these")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench-api-")
+    # Read by database.py and chatbot.py at import, so set before the app is imported
+    os.environ["PORTFOLIO_DB_PATH"] = os.path.join(scratch, "portfolio.db")
+    os.environ["CHATBOT_MODEL_DIR"] = os.path.join(scratch, "model")
+    os.environ.pop("CONTENT_SNAPSHOT_PATH", None)
+    os.environ["RATE_LIMIT_ENABLED"] = "0"     # One client hammering is the point here
+    os.environ["ADMIN_TOKEN"] = "bench"         # Admin routes are benchmarked too
+    try:
+        print(f"{'scenario':<34}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+bench_bootstrap.py
+------------------
+API round trips of a page load, before and after POST /api/bootstrap.
+
+A page load is the requests the frontend sends when the portfolio mounts:
+
+  - separate    GET /api/projects, /api/experience, /api/skills and
+                POST /api/analytics/visit, in parallel (the old fan-out)
+  - bootstrap   one POST /api/bootstrap with every field
+  - static      one POST /api/bootstrap?fields=total_visits, the content
+                coming from the static export (export_static.py) instead
+
+Each page load is timed end to end with ``--rtt`` milliseconds of network
+delay added to every request (requests of one load overlap, as in a
+browser), and the report lists API requests, response bytes and the p50 /
+p95 page-load time per mode. The app runs in process behind an httpx ASGI
+client on a throwaway database, like bench_api.py.
+
+Usage (from backend/):
+    python benchmarks/bench_bootstrap.py [--loads 200] [--rtt 40]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+VISIT = {"path": "/", "referrer": ""}
+
+
+def page_loads(client, rtt: float) -> dict:
+    async def request(method, path, **kwargs):
+        await asyncio.sleep(rtt)
+        response = await client.request(method, path, **kwargs)
+        assert response.status_code == 200, (path, response.status_code)
+        return len(response.content)
+
+    async def separate():
+        return await asyncio.gather(
+            request("GET", "/api/projects"),
+            request("GET", "/api/experience"),
+            request("GET", "/api/skills"),
+            request("POST", "/api/analytics/visit", json=VISIT),
+        )
+
+    async def bootstrap():
+        return [await request("POST", "/api/bootstrap", json=VISIT)]
+
+    async def static():
+        return [await request("POST", "/api/bootstrap", json=VISIT, params={"fields": "total_visits"})]
+
+    return {"separate": separate, "bootstrap": bootstrap, "static": static}
+
+
+async def run(args) -> dict:
+    import httpx
+
+    import main
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, load in page_loads(client, args.rtt / 1000).items():
+                await load()                                    # Warm-up
+                times, sizes = [], None
+                for _ in range(args.loads):
+                    start = time.perf_counter()
+                    sizes = await load()
+                    times.append((time.perf_counter() - start) * 1000)
+                times.sort()
+                results[name] = {
+                    "requests": len(sizes),
+                    "bytes": sum(sizes),
+                    "p50_ms": statistics.median(times),
+                    "p95_ms": times[int(0.95 * (len(times) - 1))],
+                }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loads", type=int, default=200, help="page loads per mode")
+    parser.add_argument("--rtt", type=float, default=40.0, help="network delay per request, ms")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench-bootstrap-")
+    os.environ["PORTFOLIO_DB_PATH"] = os.path.join(scratch, "portfolio.db")
+    os.environ["CHATBOT_MODEL_DIR"] = os.path.join(scratch, "model")
+    os.environ.pop("CONTENT_SNAPSHOT_PATH", None)
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{args.loads} page loads per mode, {args.rtt:g} ms added per request\n")
+    print(f"{'mode':<12}{'requests':>10}{'bytes':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['requests']:>10}{r['bytes']:>9}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
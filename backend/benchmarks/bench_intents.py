@@ -0,0 +1,103 @@
+"""
+bench_intents.py
+----------------
+Micro-benchmark: keyword-gated IntentRouter vs. the sequential regex loop it
+replaced (GREETING_PATTERNS.match, then one search per small-talk pattern).
+
+The corpus mixes greetings, small talk and — like real traffic — mostly
+domain questions that match no intent. Both implementations are first
+checked to agree on every query.
+
+Usage (from backend/):
+    python benchmarks/bench_intents.py [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import chatbot  # noqa: E402
+from database import init_db  # noqa: E402
+
+GREETINGS = ["hi", "Hello!", "hey there", "good morning", "what's up", "sup", "hii", "yo Aviral"]
+SMALLTALK = [
+    "who are you?", "what can you do", "can you help me", "thanks!", "thank you so much",
+    "bye", "see you later", "how are you doing?", "ok thx", "take care",
+]
+DOMAIN = [
+    "What projects has Aviral built?", "tell me about his experience", "what are his skills",
+    "Where did he study?", "what is his GPA", "how do I contact him", "fraud shield details",
+    "telecom churn prediction model", "medicine recommendation chatbot", "salesforce internship",
+    "which databases does he know", "does he know power bi", "python and machine learning",
+    "what frameworks does he use", "explain the risk scoring engine", "is he open to work",
+    "give me his linkedin profile", "what did he do at YBI Foundation",
+    "what tech stack was used for the fraud detection system", "summarize his background",
+]
+
+
+def corpus():
+    # Roughly 1 greeting : 1 small talk : 4 domain questions
+    queries = GREETINGS + SMALLTALK + DOMAIN * 2
+    for item in chatbot.load_entries():
+        queries.append(f"tell me about {item['label'].lower()}")
+    return queries
+
+
+def legacy_route(text: str):
+    if chatbot.GREETING_PATTERNS.match(text):
+        return "greeting"
+    for pattern, response in chatbot.SMALLTALK_PATTERNS.items():
+        if pattern.search(text):
+            return response
+    return None
+
+
+def router_route(text: str):
+    intent = chatbot.INTENT_ROUTER.route(text)
+    if intent is None or intent == "greeting":
+        return intent
+    return chatbot._SMALLTALK_RESPONSES[intent]
+
+
+def timeit(fn, queries, repeat):
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for q in queries:
+                fn(q)
+        best = min(best, time.perf_counter() - start)
+    return best / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    queries = corpus()
+    mismatches = [q for q in queries if legacy_route(q) != router_route(q)]
+    if mismatches:
+        sys.exit(f"Router disagrees with the legacy loop on: {mismatches}")
+
+    groups = {
+        "all": queries,
+        "greetings": GREETINGS,
+        "small talk": SMALLTALK,
+        "domain (no intent)": DOMAIN,
+    }
+    print(f"{len(queries)} queries, identical results\n")
+    print(f"{'subset':<20}{'loop ns/q':>12}{'router ns/q':>14}{'speedup':>10}")
+    for name, subset in groups.items():
+        loop = timeit(legacy_route, subset, args.repeat)
+        router = timeit(router_route, subset, args.repeat)
+        print(f"{name:<20}{loop * 1e9:>12.0f}{router * 1e9:>14.0f}{loop / router:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+bench_ratelimit.py
+------------------
+Per-request cost of the rate limiter (ratelimit.py).
+
+  - acquire      TokenBuckets.acquire() for clients cycling through a table
+                 at its MAX_CLIENTS bound, so every call also evicts
+  - middleware   RateLimitMiddleware in front of an empty ASGI app, minus
+                 the same app with limiting disabled
+
+Usage (from backend/):
+    python benchmarks/bench_ratelimit.py [--requests 200000] [--clients 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import ratelimit  # noqa: E402
+
+
+async def _empty_app(scope, receive, send):
+    pass
+
+
+async def _drive(middleware, scopes) -> float:
+    start = time.perf_counter()
+    for scope in scopes:
+        await middleware(scope, None, None)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=2 * ratelimit.MAX_CLIENTS,
+                        help="distinct client addresses (above MAX_CLIENTS forces evictions)")
+    args = parser.parse_args()
+
+    addresses = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    requests = [addresses[i % args.clients] for i in range(args.requests)]
+
+    buckets = ratelimit.TokenBuckets(*ratelimit.BUDGETS["read"])
+    now = time.monotonic()
+    start = time.perf_counter()
+    for client in requests:
+        buckets.acquire(client, now)
+    acquire_us = (time.perf_counter() - start) / args.requests * 1e6
+
+    # Budgets large enough that every request is admitted and reaches the app
+    for name in ratelimit.buckets:
+        ratelimit.buckets[name] = ratelimit.TokenBuckets(1e9, args.requests)
+    scopes = [
+        {"type": "http", "method": "GET", "path": "/api/projects", "client": (client, 50000)}
+        for client in requests
+    ]
+    limited = asyncio.run(_drive(ratelimit.RateLimitMiddleware(_empty_app, enabled=True), scopes))
+    bare = asyncio.run(_drive(ratelimit.RateLimitMiddleware(_empty_app, enabled=False), scopes))
+    middleware_us = (limited - bare) / args.requests * 1e6
+
+    print(f"{args.requests} requests from {args.clients} clients "
+          f"(table bound {ratelimit.MAX_CLIENTS}, {len(buckets)} remembered)")
+    print(f"{'acquire':<14}{acquire_us:>8.2f} us")
+    print(f"{'middleware':<14}{middleware_us:>8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
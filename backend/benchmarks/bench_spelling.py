@@ -0,0 +1,122 @@
+"""
+bench_spelling.py
+-----------------
+Cost and accuracy of the chatbot's typo correction (spelling.py).
+
+  - per query   microseconds SpellingCorrector.correct() adds to a query
+                whose words are all known, and to one with typos
+  - lookup      one correction through the deletion index against the
+                naive alternative: an edit-distance scan of the vocabulary
+  - accuracy    corrections of a list of misspelled queries, and how many
+                on-topic queries (eval_queries.json) it leaves unchanged
+
+Usage (from backend/):
+    python benchmarks/bench_spelling.py [--engine tfidf] [--repeat 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_queries.json")
+sys.path.insert(0, BACKEND_DIR)
+
+import chatbot  # noqa: E402
+from database import init_db  # noqa: E402
+from spelling import SHORT_WORD_LENGTH, edit_distance  # noqa: E402
+
+# (misspelled query, expected correction)
+TYPOS = [
+    ("projcts", "projects"),
+    ("expirience", "experience"),
+    ("educaton", "education"),
+    ("pyhton", "python"),
+    ("machne lerning", "machine learning"),
+    ("fraud sheild", "fraud shield"),
+    ("telecom chrun", "telecom churn"),
+    ("linkdin", "linkedin"),
+    ("dashbords", "dashboards"),
+    ("what skils does he have", "what skills does he have"),
+    ("salesfroce internship", "salesforce internship"),
+    ("fraud detecton", "fraud detection"),
+]
+KNOWN = "what projects has he built with python and machine learning"
+
+
+def per_query_us(speller, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        speller.correct(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def scan_suggest(speller, word: str):
+    """The same suggestion found by checking every vocabulary word."""
+    limit = 1 if len(word) <= SHORT_WORD_LENGTH else speller.max_distance
+    best_key, best = None, None
+    for candidate, freq in speller.words.items():
+        if candidate.startswith(word) or word.startswith(candidate):
+            continue
+        distance = edit_distance(word, candidate, limit)
+        if distance <= limit and (best_key is None or (distance, -freq, candidate) < best_key):
+            best, best_key = candidate, (distance, -freq, candidate)
+    return best
+
+
+def lookup_us(fn, words, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for word in words:
+            fn(word)
+    return (time.perf_counter() - start) / (repeat * len(words)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--engine", choices=sorted(chatbot.ENGINES), default=chatbot.CHATBOT_ENGINE)
+    parser.add_argument("--repeat", type=int, default=2000, help="passes per timing")
+    args = parser.parse_args()
+
+    init_db()
+    entries = chatbot.load_entries()
+    model = chatbot.ENGINES[args.engine].fit(entries, None)
+    start = time.perf_counter()
+    speller = model.speller
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"{args.engine}: {len(speller.words)} words, {len(speller._deletes)} index keys, "
+          f"built in {build_ms:.1f} ms\n")
+
+    typo_text = " ".join(query for query, _ in TYPOS)
+    typo_words = [word for query, _ in TYPOS for word in query.split()
+                  if word not in speller.words and word not in speller.ignore]
+    lookup_repeat = max(1, args.repeat // 20)
+    index_us = lookup_us(speller.suggest, typo_words, lookup_repeat)
+    scan_us = lookup_us(lambda word: scan_suggest(speller, word), typo_words, lookup_repeat)
+    assert all(speller.suggest(w) == scan_suggest(speller, w) for w in typo_words)
+
+    print(f"{'per query':<34}{'us':>8}")
+    print(f"{'  known words (' + str(len(KNOWN.split())) + ')':<34}"
+          f"{per_query_us(speller, KNOWN, args.repeat):>8.1f}")
+    print(f"{'  typo queries, per query':<34}"
+          f"{per_query_us(speller, typo_text, args.repeat) / len(TYPOS):>8.1f}")
+    print(f"\n{'one correction':<34}{'us':>8}")
+    print(f"{'  deletion index':<34}{index_us:>8.1f}")
+    print(f"{'  vocabulary scan':<34}{scan_us:>8.1f}   ({scan_us / index_us:.0f}x)")
+
+    fixed = sum(speller.correct(query) == expected for query, expected in TYPOS)
+    with open(QUERIES_PATH, encoding="utf-8") as f:
+        on_topic = [item["query"] for item in json.load(f) if item["label"]]
+    untouched = sum(speller.correct(query) == query.lower() for query in on_topic)
+    print(f"\ntypos corrected        {fixed}/{len(TYPOS)}")
+    print(f"on-topic unchanged     {untouched}/{len(on_topic)}")
+    for query, expected in TYPOS:
+        corrected = speller.correct(query)
+        if corrected != expected:
+            print(f"  missed: {query!r} -> {corrected!r} (expected {expected!r})")
+
+
+if __name__ == "__main__":
+    main()
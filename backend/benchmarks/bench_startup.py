@@ -0,0 +1,96 @@
+"""
+bench_startup.py
+----------------
+Startup-time benchmark for the API and the chatbot model.
+
+Every measurement runs in a fresh interpreter so import caches do not leak
+between runs:
+  - import main        time to import the app (chatbot model not loaded)
+  - model cold         first get_model() with no artifact: fit + persist
+  - model warm         first get_model() with the artifact: memory-map load
+  - first answer warm  import + first chatbot answer with the artifact
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    "import main": (
+        "import time; t = time.perf_counter(); import main; "
+        "print(time.perf_counter() - t)"
+    ),
+    "model load": (
+        "import chatbot, database, time; database.init_db(); "
+        "t = time.perf_counter(); chatbot.get_model(); "
+        "print(time.perf_counter() - t)"
+    ),
+    "first answer": (
+        "import database, time; database.init_db(); t = time.perf_counter(); import chatbot; "
+        "chatbot.get_answer('what projects has he built'); print(time.perf_counter() - t)"
+    ),
+}
+
+
+def _run(snippet: str, model_dir: str) -> float:
+    env = {**os.environ, "CHATBOT_MODEL_DIR": model_dir}
+    out = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _summary(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    model_dir = tempfile.mkdtemp(prefix="chatbot-model-")
+    results = {}
+    try:
+        results["import main"] = [_run(SNIPPETS["import main"], model_dir) for _ in range(args.runs)]
+
+        cold = []
+        for _ in range(args.runs):
+            shutil.rmtree(model_dir, ignore_errors=True)
+            cold.append(_run(SNIPPETS["model load"], model_dir))
+        results["model cold (fit + save)"] = cold
+
+        results["model warm (mmap load)"] = [
+            _run(SNIPPETS["model load"], model_dir) for _ in range(args.runs)
+        ]
+        results["first answer warm"] = [
+            _run(SNIPPETS["first answer"], model_dir) for _ in range(args.runs)
+        ]
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+    report = {name: _summary(samples) for name, samples in results.items()}
+    width = max(len(name) for name in report)
+    for name, stats in report.items():
+        print(f"{name:<{width}}  median {stats['median_ms']:>8.1f} ms   "
+              f"min {stats['min_ms']:>8.1f}   max {stats['max_ms']:>8.1f}")
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+bench_stream_ttfb.py
+--------------------
+Local load test: time-to-first-byte and total time of POST /api/chatbot
+versus the NDJSON stream at POST /api/chatbot/stream.
+
+Starts the API with uvicorn on a free local port in a background thread,
+then runs concurrent clients (http.client, one keep-alive connection each)
+against answers of increasing length: a greeting, a single-section answer
+and a composed multi-section answer. TTFB is the time until the first body
+line arrives, which for the stream is the "meta" event with the heading.
+
+Usage (from backend/):
+    python benchmarks/bench_stream_ttfb.py [--clients 8] [--requests 200]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+import uvicorn  # noqa: E402
+
+import main  # noqa: E402
+
+CASES = {
+    "greeting": {"query": "hello"},
+    "single section": {"query": "fraud detection python"},
+    "composed": {"query": "fraud detection python", "compose": True},
+}
+ENDPOINTS = ("/api/chatbot", "/api/chatbot/stream")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _client(port: int, path: str, payload: dict, count: int) -> list:
+    """Send ``count`` requests on one connection; (ttfb, total, bytes) each."""
+    body = json.dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    samples = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            conn.request("POST", path, body, headers)
+            resp = conn.getresponse()
+            first = resp.readline()
+            ttfb = time.perf_counter() - start
+            rest = resp.read()
+            samples.append((ttfb, time.perf_counter() - start, len(first) + len(rest)))
+    finally:
+        conn.close()
+    return samples
+
+
+def run_case(port: int, path: str, payload: dict, clients: int, requests: int) -> dict:
+    per_client = max(1, requests // clients)
+    with ThreadPoolExecutor(clients) as pool:
+        futures = [pool.submit(_client, port, path, payload, per_client) for _ in range(clients)]
+        samples = [s for f in futures for s in f.result()]
+    ttfb = sorted(s[0] for s in samples)
+    total = sorted(s[1] for s in samples)
+    return {
+        "requests": len(samples),
+        "bytes": samples[0][2],
+        "ttfb_p50_ms": round(statistics.median(ttfb) * 1000, 2),
+        "ttfb_p95_ms": round(ttfb[int(len(ttfb) * 0.95) - 1] * 1000, 2),
+        "total_p50_ms": round(statistics.median(total) * 1000, 2),
+    }
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="per case and endpoint")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = start_server(port)
+    try:
+        main.chatbot_engine.get_model()
+        for payload in CASES.values():   # Warm the model and the answer cache
+            _client(port, ENDPOINTS[0], payload, 1)
+
+        report = {}
+        print(f"{'case':<16}{'endpoint':<22}{'bytes':>7}{'ttfb p50':>10}{'ttfb p95':>10}{'total p50':>11}")
+        for name, payload in CASES.items():
+            for path in ENDPOINTS:
+                result = run_case(port, path, payload, args.clients, args.requests)
+                report[f"{name} {path}"] = result
+                print(f"{name:<16}{path:<22}{result['bytes']:>7}{result['ttfb_p50_ms']:>10.2f}"
+                      f"{result['ttfb_p95_ms']:>10.2f}{result['total_p50_ms']:>11.2f}")
+        print(json.dumps(report))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,171 @@
+"""
+bench_workers.py
+----------------
+Per-worker memory and cold-start time as the worker count grows, for
+
+  - serve.py     the launcher: model and content prebuilt once, then
+                 memory-mapped by every worker
+  - uvicorn      plain ``uvicorn main:app --workers N`` with no artifacts,
+                 so every worker fits the model and builds its own snapshot
+
+For each worker count the server is started fresh (empty model and
+snapshot directories), "ready" is the time from launch until both
+/api/projects and /api/chatbot answer, and memory is read after a short
+warm-up from /proc: RSS counts shared pages in full for every worker, PSS
+splits them between the processes that share them. Linux only.
+
+Usage (from backend/):
+    python benchmarks/bench_workers.py [--workers 1 2 4]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WARM_UP_REQUESTS = 40
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(port: int, method: str, path: str, body=None) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        headers = {"Content-Type": "application/json"} if body else {}
+        conn.request(method, path, json.dumps(body) if body else None, headers)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    finally:
+        conn.close()
+
+
+def _wait_ready(port: int, process, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            if (_request(port, "GET", "/api/projects") == 200
+                    and _request(port, "POST", "/api/chatbot", {"query": "skills"}) == 200):
+                return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError("server did not become ready")
+
+
+def _memory_kb(pid: int) -> tuple:
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        pss = next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+    return rss, pss
+
+
+def _descendants(pid: int) -> list:
+    children = {}
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            try:
+                with open(f"/proc/{name}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(name))
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def _worker_pids(root: int, workers: int) -> list:
+    """The processes serving requests: the workers, or the server itself with one worker."""
+    if workers == 1:
+        return [root]
+    pids = []
+    for pid in _descendants(root):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if b"spawn_main" in f.read():
+                    pids.append(pid)
+        except OSError:
+            pass
+    return pids
+
+
+def run(mode: str, workers: int) -> dict:
+    port = _free_port()
+    scratch = tempfile.mkdtemp(prefix="bench-workers-")
+    env = {
+        **os.environ,
+        "CHATBOT_MODEL_DIR": os.path.join(scratch, "model"),
+        "CONTENT_SNAPSHOT_DIR": os.path.join(scratch, "snapshot"),
+        "RATE_LIMIT_ENABLED": "0",
+    }
+    env.pop("CONTENT_SNAPSHOT_PATH", None)
+    if mode == "serve.py":
+        cmd = [sys.executable, "serve.py"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1"]
+    cmd += ["--workers", str(workers), "--port", str(port), "--log-level", "warning"]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, start_new_session=True)
+    try:
+        _wait_ready(port, process)
+        ready = time.perf_counter() - start
+        for i in range(WARM_UP_REQUESTS):
+            _request(port, "GET", "/api/projects")
+            _request(port, "POST", "/api/chatbot", {"query": f"projects {i}"})
+        # With the plain server, workers still fitting in the background would skew memory
+        time.sleep(1.0)
+        samples = [_memory_kb(pid) for pid in _worker_pids(process.pid, workers)]
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "ready_s": round(ready, 2),
+        "workers_measured": len(samples),
+        "rss_mb_per_worker": round(sum(s[0] for s in samples) / len(samples) / 1024, 1),
+        "pss_mb_per_worker": round(sum(s[1] for s in samples) / len(samples) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark reads /proc (Linux only)")
+
+    report = {}
+    print(f"{'mode':<10}{'workers':>8}{'ready s':>10}{'RSS MB/worker':>15}{'PSS MB/worker':>15}")
+    for mode in ("uvicorn", "serve.py"):
+        for workers in args.workers:
+            result = run(mode, workers)
+            report[f"{mode} x{workers}"] = result
+            print(f"{mode:<10}{workers:>8}{result['ready_s']:>10.2f}"
+                  f"{result['rss_mb_per_worker']:>15.1f}{result['pss_mb_per_worker']:>15.1f}")
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
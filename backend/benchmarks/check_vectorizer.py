@@ -0,0 +1,112 @@
+"""
+check_vectorizer.py
+-------------------
+Regression suite and memory comparison for vectorizer.QueryVectorizer.
+
+1. Fits scikit-learn's TfidfVectorizer on the chatbot corpus and checks that
+   QueryVectorizer produces bit-for-bit identical query vectors and
+   retrieval scores for every query in the suite (knowledge entry labels,
+   keywords, content sentences and hand-written queries).
+2. Measures the resident memory of a fresh worker after answering one
+   query on the NumPy-only path versus the same worker with scikit-learn
+   imported (Linux only: reads /proc/self/status).
+
+Exits non-zero if any vector or score differs.
+
+Usage (from backend/):
+    python benchmarks/check_vectorizer.py
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+HANDWRITTEN = [
+    "What projects has Aviral built?", "skills", "tech stack", "tell me about his experience",
+    "Where did he study?", "GPA", "contact email", "LinkedIn?", "fraud shield", "telecom churn",
+    "medicine bot", "salesforce internship", "YBI Foundation", "power bi dashboards",
+    "machine learning with python", "projcts", "expirience", "weather today", "",
+    "risk scoring risk scoring risk scoring", "UPI phishing & KYC fraud!!", "Naïve café résumé",
+    "data   science\tintern\nYBI", "is he good at NLP and deep learning models?",
+]
+
+RSS_SNIPPET = """
+import sys
+{extra}
+import chatbot
+from database import init_db
+init_db()
+chatbot.get_answer("what projects has he built")
+rss = next(l for l in open("/proc/self/status") if l.startswith("VmRSS:")).split()[1]
+print("sklearn" in sys.modules, rss)
+"""
+
+
+def build_suite(knowledge_base):
+    queries = list(HANDWRITTEN)
+    for item in knowledge_base:
+        words = item["keywords"].split()
+        queries += [item["label"], item["keywords"], " ".join(words[:2]), " ".join(words[-3:])]
+        queries += [line.strip() for line in item["content"].splitlines() if line.strip()]
+    return queries
+
+
+def check_regression() -> int:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    import chatbot
+    from database import init_db
+
+    init_db()
+    entries = chatbot.load_entries()
+    model = chatbot.load_model(entries, engine="tfidf")
+    reference = TfidfVectorizer(**chatbot.VECTORIZER_PARAMS)
+    reference.fit(chatbot._corpus(entries))
+
+    queries = build_suite(entries)
+    expected = reference.transform(queries)
+    actual = model.vectorizer.transform(queries)
+
+    failures = 0
+    for i, query in enumerate(queries):
+        e, a = expected[i], actual[i]
+        same_vector = (
+            np.array_equal(e.indices, a.indices) and np.array_equal(e.data, a.data)
+        )
+        same_scores = np.array_equal(model.index.scores(e), model.index.scores(a))
+        if not (same_vector and same_scores):
+            failures += 1
+            print(f"MISMATCH: {query!r}")
+
+    print(f"{len(queries) - failures}/{len(queries)} queries bit-for-bit identical")
+    return failures
+
+
+def _rss_kb(extra: str) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", RSS_SNIPPET.format(extra=extra)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    loaded, rss = out.stdout.split()
+    return loaded == "True", int(rss)
+
+
+def report_memory():
+    if not os.path.exists("/proc/self/status"):
+        print("RSS comparison needs /proc (Linux only); skipped")
+        return
+    numpy_only = _rss_kb("")
+    with_sklearn = _rss_kb("import sklearn.feature_extraction.text")
+    for name, (loaded, rss) in (("NumPy-only path", numpy_only), ("with scikit-learn", with_sklearn)):
+        print(f"{name:<18} RSS {rss / 1024:7.1f} MB   sklearn imported: {loaded}")
+
+
+if __name__ == "__main__":
+    failed = check_regression()
+    report_memory()
+    sys.exit(1 if failed else 0)
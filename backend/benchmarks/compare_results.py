@@ -0,0 +1,78 @@
+"""
+compare_results.py
+------------------
+Compare two bench_api.py result files, e.g. before and after a change to
+database.py or chatbot.py.
+
+For every scenario in both files it prints the throughput and p50 / p95 /
+p99 latency of each run and the relative change. A scenario counts as a
+regression when its p95 latency grows, or its throughput drops, by more
+than --threshold; the exit status is 1 if any scenario regressed.
+
+Usage (from backend/):
+    python benchmarks/compare_results.py base.json new.json [--threshold 0.10]
+"""
+
+import argparse
+import json
+import sys
+
+
+def _change(base: float, new: float) -> float:
+    return (new - base) / base if base else 0.0
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """Print the comparison table and return the names of regressed scenarios."""
+    print(f"base: {base['environment']['commit'] or '?'}"
+          f"{' (dirty)' if base['environment']['dirty'] else ''}   "
+          f"new: {new['environment']['commit'] or '?'}"
+          f"{' (dirty)' if new['environment']['dirty'] else ''}")
+    print(f"{'scenario':<34}{'req/s':>17}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}")
+
+    regressions = []
+    for name, before in base["scenarios"].items():
+        after = new["scenarios"].get(name)
+        if after is None:
+            continue
+        cells = [(before["throughput_rps"], after["throughput_rps"])] + [
+            (before["latency_ms"][q], after["latency_ms"][q]) for q in ("p50", "p95", "p99")
+        ]
+        row = "".join(
+            f"{b:>8.1f} {_change(b, a):>+8.1%} " if i == 0 else f"{b:>9.2f} {_change(b, a):>+9.1%} "
+            for i, (b, a) in enumerate(cells)
+        )
+        regressed = (
+            _change(*cells[0]) < -threshold or _change(*cells[2]) > threshold
+        )
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<34}{row}{'  <- regression' if regressed else ''}")
+
+    skipped = set(base["scenarios"]) ^ set(new["scenarios"])
+    if skipped:
+        print(f"Only in one file: {', '.join(sorted(skipped))}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
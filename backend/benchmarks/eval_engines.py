@@ -0,0 +1,133 @@
+"""
+eval_engines.py
+---------------
+Offline accuracy and latency comparison of the chatbot's retrieval engines
+(chatbot.ENGINES: TF-IDF and BM25).
+
+The labeled query set combines the hand-written questions in
+eval_queries.json (expected knowledge label, or null for off-topic queries
+that should fall back) with queries generated from every knowledge entry:
+its label, its first two keywords and its last three keywords. Both engines
+are built from the same entries without touching the saved models, then
+
+  - accuracy   top-1 answers above the engine's match threshold that hit
+               the expected entry, the mean reciprocal rank of the expected
+               entry in the top TOP_K, and how many off-topic queries fell
+               back as they should
+  - latency    one query at a time (encode + search, like POST /api/chatbot)
+               and the whole set as one batch (like /api/chatbot/batch)
+
+With --sweep it also prints accuracy across a range of thresholds, which is
+how the per-engine MATCH_THRESHOLD values were picked.
+
+Usage (from backend/):
+    python benchmarks/eval_engines.py [--sweep] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_queries.json")
+sys.path.insert(0, BACKEND_DIR)
+
+import chatbot  # noqa: E402
+from database import init_db  # noqa: E402
+
+SWEEP = (0.02, 0.04, 0.06, 0.08, 0.10, 0.12, 0.15, 0.20, 0.25, 0.30)
+
+
+def labeled_queries(entries) -> list:
+    """[(query, expected label or None), ...]"""
+    with open(QUERIES_PATH, encoding="utf-8") as f:
+        queries = [(item["query"], item["label"]) for item in json.load(f)]
+    for item in entries:
+        words = item["keywords"].split()
+        queries += [
+            (item["label"], item["label"]),
+            (" ".join(words[:2]), item["label"]),
+            (" ".join(words[-3:]), item["label"]),
+        ]
+    return queries
+
+
+def accuracy(model, queries, threshold: float) -> dict:
+    indices, scores = model.search(model.encode([q for q, _ in queries]), chatbot.TOP_K)
+    hits = reciprocal = on_topic = rejected = off_topic = 0
+    for (query, expected), row, row_scores in zip(queries, indices, scores):
+        if expected is None:
+            off_topic += 1
+            rejected += row_scores[0] < threshold
+            continue
+        on_topic += 1
+        ranked = [model.labels[i] for i in row]
+        hits += row_scores[0] >= threshold and ranked[0] == expected
+        if expected in ranked:
+            reciprocal += 1 / (ranked.index(expected) + 1)
+    return {
+        "top1": hits / on_topic,
+        "mrr": reciprocal / on_topic,
+        "fallback": rejected / off_topic if off_topic else 1.0,
+        "on_topic": on_topic,
+        "off_topic": off_topic,
+    }
+
+
+def latency(model, queries, repeat: int) -> dict:
+    texts = [q for q, _ in queries]
+    single = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            model.search(model.encode([text]), chatbot.TOP_K)
+            single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.search(model.encode(texts), chatbot.TOP_K)
+    batch = (time.perf_counter() - start) / repeat
+    single = np.array(single) * 1e6
+    return {
+        "single_p50_us": float(np.percentile(single, 50)),
+        "single_p95_us": float(np.percentile(single, 95)),
+        "batch_queries_per_s": len(texts) / batch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sweep", action="store_true", help="accuracy across thresholds")
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the set for latency")
+    args = parser.parse_args()
+
+    init_db()
+    entries = chatbot.load_entries()
+    queries = labeled_queries(entries)
+    models = {name: model_cls.fit(entries, None) for name, model_cls in chatbot.ENGINES.items()}
+
+    print(f"{len(queries)} labeled queries over {len(entries)} entries\n")
+    print(f"{'engine':<8}{'threshold':>10}{'top-1':>8}{'MRR@' + str(chatbot.TOP_K):>8}"
+          f"{'fallback':>10}{'p50 us':>9}{'p95 us':>9}{'batch q/s':>11}")
+    for name, model in models.items():
+        acc = accuracy(model, queries, model.match_threshold)
+        lat = latency(model, queries, args.repeat)
+        print(f"{name:<8}{model.match_threshold:>10.2f}{acc['top1']:>8.1%}{acc['mrr']:>8.3f}"
+              f"{acc['fallback']:>10.1%}{lat['single_p50_us']:>9.0f}{lat['single_p95_us']:>9.0f}"
+              f"{lat['batch_queries_per_s']:>11.0f}")
+
+    if args.sweep:
+        print(f"\n{'threshold':<10}" + "".join(f"{name + ' top-1/fallback':>26}" for name in models))
+        for threshold in SWEEP:
+            cells = []
+            for model in models.values():
+                acc = accuracy(model, queries, threshold)
+                cells.append(f"{acc['top1']:>18.1%} / {acc['fallback']:>5.0%}")
+            print(f"{threshold:<10.2f}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+bm25.py
+-------
+Okapi BM25 retrieval over a compact inverted index.
+
+Postings are three flat arrays, CSR style: ``offsets[t]:offsets[t + 1]``
+slices ``doc_ids`` (int32) and ``weights`` (float32) for term ``t``. Each
+weight is that term's full BM25 contribution to that document, computed at
+build time, so a query is scored by gathering the postings of its terms and
+summing them per document: documents that share no term with the query are
+never touched.
+
+Scores are divided by the query's upper bound: every query term at
+saturated frequency, with words the index has never seen counted at the
+highest idf any term can have. They fall in [0, 1), thresholds do not
+depend on query length, and a query sharing one word in three with an
+entry scores low instead of matching it fully.
+"""
+
+import math
+
+import numpy as np
+
+K1 = 1.2
+B = 0.75
+
+
+class Bm25Index:
+    """Inverted index over a fixed set of analyzed documents (lists of terms)."""
+
+    def __init__(self, vocabulary: dict, offsets, doc_ids, weights, idf, n_docs: int, k1: float = K1):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.idf = idf
+        self.n_docs = n_docs
+        self.k1 = k1
+
+    @classmethod
+    def build(cls, documents: list, k1: float = K1, b: float = B):
+        terms = sorted({term for doc in documents for term in doc})
+        vocabulary = {term: i for i, term in enumerate(terms)}
+        lengths = [len(doc) for doc in documents]
+        avg_length = (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+
+        postings = [[] for _ in terms]          # term -> [(doc, tf), ...] in doc order
+        for d, doc in enumerate(documents):
+            counts = {}
+            for term in doc:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                postings[vocabulary[term]].append((d, tf))
+
+        n_docs = len(documents)
+        idf = np.array(
+            [math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for p in postings],
+            dtype=np.float64,
+        )
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in postings])
+        doc_ids = np.empty(offsets[-1], dtype=np.int32)
+        weights = np.empty(offsets[-1], dtype=np.float32)
+        for t, plist in enumerate(postings):
+            start = offsets[t]
+            for n, (d, tf) in enumerate(plist):
+                norm = k1 * (1 - b + b * lengths[d] / avg_length)
+                doc_ids[start + n] = d
+                weights[start + n] = idf[t] * tf * (k1 + 1) / (tf + norm)
+        return cls(vocabulary, offsets, doc_ids, weights, idf, n_docs, k1)
+
+    @property
+    def size(self) -> int:
+        return self.n_docs
+
+    def encode(self, analyzed_queries):
+        """
+        ``(term_ids, unknown)`` for search(): each query's distinct
+        in-vocabulary term ids, and how many distinct words (unigrams) it
+        has that the index never saw. Unseen n-grams are not counted, since
+        natural phrasing produces them all the time.
+        """
+        vocabulary = self.vocabulary
+        term_ids, unknown = [], []
+        for terms in analyzed_queries:
+            ids, missing = set(), set()
+            for term in terms:
+                j = vocabulary.get(term)
+                if j is not None:
+                    ids.add(j)
+                elif " " not in term:
+                    missing.add(term)
+            term_ids.append(np.fromiter(sorted(ids), dtype=np.int64, count=len(ids)))
+            unknown.append(len(missing))
+        return term_ids, np.asarray(unknown, dtype=np.float64)
+
+    def search(self, encoded, k: int = 1):
+        """
+        Top-``k`` documents per encoded query as ``(indices, scores)``, each
+        shaped (n_queries x k) and ordered best first; equal scores are
+        ordered by document index, and documents sharing no term with the
+        query fill the remaining slots with score 0.
+        """
+        queries, unknown = encoded
+        n, k = len(queries), max(1, min(k, self.n_docs))
+        indices = np.full((n, k), -1, dtype=np.int64)
+        scores = np.zeros((n, k), dtype=np.float64)
+
+        lengths = np.array([len(q) for q in queries], dtype=np.int64)
+        if lengths.sum():
+            terms = np.concatenate(queries)
+            owner = np.repeat(np.arange(n), lengths)
+            starts, ends = self.offsets[terms], self.offsets[terms + 1]
+            counts = ends - starts
+
+            # Positions of every posting of every query term, in one array
+            first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            positions = first + np.arange(counts.sum())
+            docs = self.doc_ids[positions]
+            query_of = np.repeat(owner, counts)
+
+            # Sum the weights per (query, doc) pair that shares a term
+            pairs, inverse = np.unique(query_of * self.n_docs + docs, return_inverse=True)
+            pair_scores = np.bincount(inverse, weights=self.weights[positions])
+            pair_query, pair_doc = np.divmod(pairs, self.n_docs)
+
+            unseen_idf = math.log(1 + (self.n_docs + 0.5) / 0.5)
+            bounds = np.bincount(owner, weights=self.idf[terms], minlength=n) + unknown * unseen_idf
+            pair_scores /= bounds[pair_query] * (self.k1 + 1)
+
+            # Best first within each query: score desc, then doc index asc
+            order = np.lexsort((pair_doc, -pair_scores, pair_query))
+            pair_query, pair_doc, pair_scores = pair_query[order], pair_doc[order], pair_scores[order]
+            rank = np.arange(len(order)) - np.searchsorted(pair_query, pair_query)
+            top = rank < k
+            indices[pair_query[top], rank[top]] = pair_doc[top]
+            scores[pair_query[top], rank[top]] = pair_scores[top]
+
+        for row in np.flatnonzero(indices[:, -1] < 0):
+            taken = set(indices[row].tolist())
+            filler = (d for d in range(self.n_docs) if d not in taken)
+            for col in range(k):
+                if indices[row, col] < 0:
+                    indices[row, col] = next(filler)
+        return indices, scores
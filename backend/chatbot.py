@@ -3,56 +3,93 @@ chatbot.py
 ----------
 Intelligent portfolio chatbot with:
   - Intent detection (greetings, small talk, domain queries)
-  - TF-IDF similarity matching on an expanded resume corpus
+  - TF-IDF (or BM25) retrieval over an expanded resume corpus
   - Structured, formatted responses
   - Contextual fallback handling
 """
 
+import hashlib
+import json
+import logging
+import os
 import re
 import random
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import shutil
+import threading
+import time
+from collections import Counter
+
 import numpy as np
+from scipy import sparse
+
+import bm25
+import knowledge
+import metrics
+from cache import LRUCache
+from intents import IntentRouter, IntentRule
+from retrieval import RetrievalIndex, l2_normalize
+from spelling import SpellingCorrector
+from vectorizer import TOKEN_PATTERN, QueryVectorizer, analyze
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 1. INTENT PATTERNS — matched before TF-IDF for speed and accuracy
 # ═══════════════════════════════════════════════════════════════════════════
 
-GREETING_PATTERNS = re.compile(
-    r"^(hi|hello|hey|hii+|hola|greetings|good\s*(morning|afternoon|evening|day)|yo|sup|what'?s?\s*up)(\s+\w+)?[\s!?.]*$",
-    re.IGNORECASE,
+GREETING_PATTERN = (
+    r"(hi|hello|hey|hii+|hola|greetings|good\s*(morning|afternoon|evening|day)|yo|sup|what'?s?\s*up)(\s+\w+)?[\s!?.]*"
 )
+GREETING_PATTERNS = re.compile(rf"^{GREETING_PATTERN}$", re.IGNORECASE)
 
-SMALLTALK_PATTERNS = {
-    re.compile(r"(who\s+are\s+you|what\s+are\s+you|about\s+you)", re.I): (
+# Small-talk intents: (name, priority, pattern, keywords, response). A lower
+# priority wins when a query matches several; greetings (priority 0) beat
+# them all. Every match of a pattern must contain one of its keywords.
+SMALLTALK_INTENTS = [
+    ("identity", 10, r"(who\s+are\s+you|what\s+are\s+you|about\s+you)", ("you",), (
         "I'm Aviral's AI portfolio assistant! 🤖 I can tell you about his "
         "skills, projects, work experience, education, and more. "
         "Just ask me anything — for example:\n\n"
         "• \"What projects has Aviral built?\"\n"
         "• \"What tech stack does he use?\"\n"
         "• \"Tell me about his experience\""
-    ),
-    re.compile(r"(what\s+(can|do)\s+you\s+do|how\s+can\s+you\s+help|help)", re.I): (
+    )),
+    ("capabilities", 20, r"(what\s+(can|do)\s+you\s+do|how\s+can\s+you\s+help|help)", ("you", "help"), (
         "I can answer questions about Aviral's portfolio! Try asking about:\n\n"
         "🔹 Projects — Fraud Shield, Telecom Churn, Medicine Bot\n"
         "🔹 Skills — Python, AI/ML, FastAPI, and more\n"
         "🔹 Experience — Data Science & Salesforce internships\n"
         "🔹 Education — B.Tech at Manipal University Jaipur\n"
         "🔹 Contact — Email, LinkedIn, GitHub"
-    ),
-    re.compile(r"(thank|thanks|thx|ty)", re.I): (
+    )),
+    ("thanks", 30, r"(thank|thanks|thx|ty)", ("thank", "thx", "ty"), (
         "You're welcome! 😊 Feel free to ask if you have more questions about Aviral."
-    ),
-    re.compile(r"(bye|goodbye|see\s*you|take\s*care)", re.I): (
+    )),
+    ("goodbye", 40, r"(bye|goodbye|see\s*you|take\s*care)", ("bye", "see", "take"), (
         "Goodbye! 👋 Thanks for visiting Aviral's portfolio. Have a great day!"
-    ),
-    re.compile(r"(how\s+are\s+you|how\s+do\s+you\s+do)", re.I): (
+    )),
+    ("wellbeing", 50, r"(how\s+are\s+you|how\s+do\s+you\s+do)", ("how",), (
         "I'm doing great, thank you for asking! 😊 "
         "I'm here to help you learn about Aviral. What would you like to know?"
-    ),
+    )),
+]
+
+# Per-pattern view in priority order (the pre-router loop; used by benchmarks)
+SMALLTALK_PATTERNS = {
+    re.compile(pattern, re.I): response
+    for _, _, pattern, _, response in sorted(SMALLTALK_INTENTS, key=lambda intent: intent[1])
 }
 
+_SMALLTALK_RESPONSES = {name: response for name, _, _, _, response in SMALLTALK_INTENTS}
+
+# Greeting + small talk resolved by one keyword-gated router (see intents.py)
+INTENT_ROUTER = IntentRouter(
+    [IntentRule("greeting", 0, GREETING_PATTERN, anchored=True)]
+    + [
+        IntentRule(name, priority, pattern, keywords)
+        for name, priority, pattern, keywords, _ in SMALLTALK_INTENTS
+    ]
+)
+
 GREETING_RESPONSES = [
     "Hey there! 👋 Welcome to Aviral's portfolio. What would you like to know about him?",
     "Hi! 😊 I'm Aviral's portfolio assistant. Ask me about his projects, skills, or experience!",
@@ -62,219 +99,541 @@ GREETING_RESPONSES = [
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 2. EXPANDED KNOWLEDGE CORPUS — richer, more detailed training data
+# 2. KNOWLEDGE BASE — stored in the knowledge table
 # ═══════════════════════════════════════════════════════════════════════════
+#
+# Entries (label, keywords, content) are rows managed by knowledge.py, seeded
+# by database._seed_knowledge() and edited through the /api/knowledge admin
+# endpoints, which call apply_knowledge_change() below.
 
-KNOWLEDGE_BASE = [
-    # ── Professional Summary ────────────────────────────────────────────
-    {
-        "label": "About Aviral",
-        "keywords": "about aviral dubey who is he summary introduction profile overview background",
-        "content": (
-            "Aviral Dubey is a Data Analyst & Applied AI Engineer based in India. "
-            "He specializes in fraud detection, machine learning, and risk analytics. "
-            "He has built real-time AI-powered fraud intelligence systems integrating "
-            "LLMs with hybrid risk scoring models.\n\n"
-            "🎓 B.Tech in Information Technology — Manipal University Jaipur\n"
-            "📊 GPA: 10.0 (Final Semester)\n"
-            "🔬 Focus: AI, Fraud Detection, Data Analytics"
-        ),
-    },
-    # ── Skills ──────────────────────────────────────────────────────────
-    {
-        "label": "Technical Skills",
-        "keywords": "skills tech stack technologies programming languages frameworks tools what can he do abilities",
-        "content": (
-            "Aviral's technical skill set:\n\n"
-            "💻 Languages: Python, SQL\n"
-            "⚙️ Frameworks: FastAPI, React\n"
-            "🤖 AI & ML: Gemini AI, Scikit-learn, NLP, Risk Modeling\n"
-            "📊 Data & Analytics: Power BI, Pandas, NumPy\n"
-            "🗄️ Databases: SQLite, MySQL\n"
-            "🛠️ Tools: Git, VS Code, REST APIs\n"
-            "📐 Concepts: Risk Scoring, Fraud Detection, API Design, System Architecture"
-        ),
-    },
-    {
-        "label": "Python & AI Skills",
-        "keywords": "python programming machine learning artificial intelligence deep learning model ml ai nlp",
-        "content": (
-            "Aviral is proficient in Python for data science and AI development.\n\n"
-            "His Python expertise includes:\n"
-            "• Machine Learning with Scikit-learn\n"
-            "• Natural Language Processing (NLP)\n"
-            "• REST API development with FastAPI\n"
-            "• Data analysis with Pandas & NumPy\n"
-            "• AI integration with Gemini AI\n"
-            "• Risk modeling and statistical analysis"
-        ),
-    },
-    # ── Projects ────────────────────────────────────────────────────────
-    {
-        "label": "All Projects",
-        "keywords": "projects portfolio work built what has he built developed created applications",
-        "content": (
-            "Aviral has built 3 major projects:\n\n"
-            "🚨 Fraud Shield — Real-time AI scam intelligence system\n"
-            "   Tech: Python, FastAPI, Gemini AI, SQLite\n\n"
-            "📊 Telecom Churn Prediction — ML-based customer attrition model\n"
-            "   Tech: Python, Scikit-learn, SQL\n\n"
-            "💊 Medicine Recommendation Bot — NLP-powered symptom analyzer\n"
-            "   Tech: Python, NLP"
-        ),
-    },
-    {
-        "label": "Fraud Shield Project",
-        "keywords": "fraud shield scam detection upi phishing risk engine real time intelligence system fraud detection",
-        "content": (
-            "🚨 Fraud Shield — Real-Time AI-Powered Scam Intelligence System\n\n"
-            "A comprehensive fraud detection platform targeting Indian digital scams "
-            "(UPI fraud, KYC phishing, OTP theft, fake job scams).\n\n"
-            "Key features:\n"
-            "• Hybrid multi-factor risk engine with 0–100 scoring:\n"
-            "  — Keyword Analysis (30%)\n"
-            "  — Identifier Pattern Matching (25%)\n"
-            "  — Report Frequency Escalation (20%)\n"
-            "  — Gemini AI Confidence (25%)\n"
-            "• Gemini 1.5 Flash integration for scam classification\n"
-            "• REST APIs for fraud reporting & dashboard analytics\n"
-            "• Identifier reputation tracking & repeat-offender detection\n\n"
-            "Tech Stack: Python, FastAPI, Gemini AI, SQLite"
-        ),
-    },
-    {
-        "label": "Telecom Churn Project",
-        "keywords": "telecom churn attrition customer prediction machine learning classification",
-        "content": (
-            "📊 Telecom Customer Attrition Prediction\n\n"
-            "Built ML models to predict telecom customer churn.\n\n"
-            "Highlights:\n"
-            "• Feature engineering & data preprocessing\n"
-            "• Model evaluation: accuracy, precision, recall, F1-score\n"
-            "• Delivered actionable business insights to reduce churn\n\n"
-            "Tech Stack: Python, Scikit-learn, SQL"
-        ),
-    },
-    {
-        "label": "Medicine Chatbot Project",
-        "keywords": "medicine recommendation chatbot health symptom medical drug pharmacy ai bot",
-        "content": (
-            "💊 AI-Based Medicine Recommendation Chatbot\n\n"
-            "An intelligent chatbot for symptom-based medicine suggestions.\n\n"
-            "Features:\n"
-            "• NLP pipeline for query interpretation\n"
-            "• Structured response logic for safe recommendations\n"
-            "• Handles natural language symptom descriptions\n\n"
-            "Tech Stack: Python, NLP"
-        ),
-    },
-    # ── Experience ──────────────────────────────────────────────────────
-    {
-        "label": "Work Experience",
-        "keywords": "experience work internship job career professional intern company",
-        "content": (
-            "Aviral's professional experience:\n\n"
-            "📊 Data Science Intern — YBI Foundation (2024)\n"
-            "• Fraud detection use cases & exploratory data analysis\n"
-            "• Power BI dashboards for business insights\n"
-            "• Data cleaning, transformation & model validation\n\n"
-            "☁️ Salesforce Summer Intern — SmartInternz (Jul 2024)\n"
-            "• Salesforce automation, Apex, LWC & security models\n"
-            "• Completed Apex Specialist & Process Automation Superbadges"
-        ),
-    },
-    {
-        "label": "Data Science Internship",
-        "keywords": "data science intern ybi foundation power bi dashboard analytics",
-        "content": (
-            "📊 Data Science Intern — YBI Foundation (2024)\n\n"
-            "Key responsibilities:\n"
-            "• Worked on fraud detection use cases and exploratory data analysis\n"
-            "• Developed Power BI dashboards for business insights and reporting\n"
-            "• Performed data cleaning, transformation, and model validation"
-        ),
-    },
-    {
-        "label": "Salesforce Internship",
-        "keywords": "salesforce intern smartinternz apex lwc lightning crm cloud summer",
-        "content": (
-            "☁️ Salesforce Summer Intern — SmartInternz (Jul 2024)\n\n"
-            "Key achievements:\n"
-            "• Gained hands-on experience in Salesforce automation\n"
-            "• Worked with Apex, Lightning Web Components (LWC), and security models\n"
-            "• Completed Apex Specialist & Process Automation Superbadges"
-        ),
-    },
-    # ── Education ───────────────────────────────────────────────────────
-    {
-        "label": "Education",
-        "keywords": "education university college degree btech bachelor study student academic gpa grade school",
-        "content": (
-            "🎓 Education\n\n"
-            "B.Tech in Information Technology\n"
-            "Manipal University Jaipur (2021–2025)\n"
-            "Final Semester GPA: 10.0\n\n"
-            "Aviral has a strong academic foundation in computer science, "
-            "data structures, algorithms, and software engineering."
-        ),
-    },
-    # ── Contact ─────────────────────────────────────────────────────────
-    {
-        "label": "Contact Information",
-        "keywords": "contact email phone reach connect linkedin github social media hire hiring",
-        "content": (
-            "📬 Contact Aviral\n\n"
-            "📧 Email: er.aviraldubey@gmail.com\n"
-            "🔗 LinkedIn: linkedin.com/in/aviral-dubey-ml-engineer\n"
-            "💻 GitHub: github.com/aviral022\n"
-            "📍 Location: India"
-        ),
-    },
-    # ── Extra context sections for better matching ──────────────────────
-    {
-        "label": "Fraud Detection Expertise",
-        "keywords": "fraud detection risk scoring risk analytics cybersecurity fintech financial security",
-        "content": (
-            "Aviral specializes in fraud detection and risk analytics.\n\n"
-            "His expertise includes:\n"
-            "• Building hybrid risk scoring models (0–100 scale)\n"
-            "• Integrating LLMs for scam classification\n"
-            "• Real-time identifier reputation tracking\n"
-            "• UPI fraud, KYC phishing, and OTP theft detection\n"
-            "• API-driven fraud intelligence dashboards"
-        ),
-    },
-    {
-        "label": "Data Analytics",
-        "keywords": "data analysis analytics power bi visualization reporting dashboard pandas numpy",
-        "content": (
-            "Aviral has strong data analytics skills:\n\n"
-            "• Power BI for interactive business dashboards\n"
-            "• Pandas & NumPy for data manipulation\n"
-            "• SQL for database querying and analysis\n"
-            "• Exploratory Data Analysis (EDA)\n"
-            "• Business insights and trend visualization"
-        ),
-    },
-]
+
+def load_entries() -> list:
+    """
+    Current knowledge entries, in retrieval-index order. Only reads: the API
+    creates and seeds the table at startup, and standalone scripts call
+    database.init_db() first.
+    """
+    return knowledge.load_entries()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 3. TF-IDF MODEL — built from combined content + keywords
+# 3. RETRIEVAL MODELS — TF-IDF (default) or BM25 over content + keywords
 # ═══════════════════════════════════════════════════════════════════════════
+#
+# CHATBOT_ENGINE picks how entries are ranked: "tfidf" (cosine similarity of
+# TF-IDF vectors, see retrieval.py) or "bm25" (an inverted index that only
+# scores entries sharing a term with the query, see bm25.py). Either model is
+# built once per version of the knowledge entries and saved under MODEL_DIR
+# as plain .npy arrays that later processes memory-map instead of rebuilding.
+# Nothing is loaded at import time: get_model() builds or loads the model on
+# first use, and warm_up() does it on a background thread. Queries are
+# analyzed by vectorizer.py, so scikit-learn is only imported when a model
+# has to be (re)built.
 
-_labels = [item["label"] for item in KNOWLEDGE_BASE]
-# Combine keywords + content for richer matching
-_corpus = [f"{item['keywords']} {item['content']}" for item in KNOWLEDGE_BASE]
-_responses = [item["content"] for item in KNOWLEDGE_BASE]
+VECTORIZER_PARAMS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),    # Unigrams + bigrams for better phrase matching
+    "max_df": 0.95,           # Ignore terms in >95% of docs
+    "min_df": 1,
+}
+# Fewest entries the admin API may leave in the knowledge table
+MIN_ENTRIES = 2
+BM25_PARAMS = {
+    "k1": bm25.K1,            # Term-frequency saturation
+    "b": bm25.B,              # Document-length normalization
+    "ngram_range": (1, 2),    # Same analyzer as TF-IDF
+    # Times each field is repeated in the indexed text (BM25F-style boost)
+    "fields": {"label": 1, "keywords": 2, "content": 1},
+}
 
-_vectorizer = TfidfVectorizer(
-    stop_words="english",
-    ngram_range=(1, 2),    # Unigrams + bigrams for better phrase matching
-    max_df=0.95,           # Ignore terms in >95% of docs
-    min_df=1,
+MODEL_FORMAT = 2
+MODEL_DIR = os.environ.get(
+    "CHATBOT_MODEL_DIR", os.path.join(os.path.dirname(__file__), ".model")
 )
-_tfidf_matrix = _vectorizer.fit_transform(_corpus)
+CHATBOT_ENGINE = os.environ.get("CHATBOT_ENGINE", "tfidf")
+
+# Number of candidates scored per query; also the most sections a composed
+# answer can have
+TOP_K = 3
+
+# Minimum score for a domain answer, per engine; below it we fall back.
+# TF-IDF scores are cosine similarities, BM25 scores are normalized by the
+# query's upper bound (both in [0, 1]). See benchmarks/eval_engines.py.
+MATCH_THRESHOLD = 0.08
+BM25_MATCH_THRESHOLD = 0.2
+
+# Composed answers (compose=True) add the runner-up matches whose score is at
+# least (1 - COMPOSE_MARGIN) x the best score, as long as the whole answer
+# stays within COMPOSE_MAX_CHARS
+COMPOSE_MARGIN = 0.25
+COMPOSE_MAX_CHARS = 1200
+
+log = logging.getLogger(__name__)
+
+
+class RetrievalModel:
+    """
+    One version of the knowledge base behind a retrieval engine.
+
+    get_answers() only calls ``encode()`` on a batch of query texts and
+    ``search()`` on the result; ``updated()`` serves live edits, and
+    ``fit()`` / ``save()`` / ``load()`` build and persist the model.
+    ``vocabulary`` and ``stop_words`` feed the typo corrector (``speller``).
+    """
+
+    name = None
+    params = {}
+    match_threshold = MATCH_THRESHOLD
+
+    @staticmethod
+    def corpus(entries) -> list:
+        """Indexed text of each entry."""
+        return _corpus(entries)
+
+    def __init__(self, entries, fingerprint):
+        self.entries = list(entries)
+        self.labels = [item["label"] for item in entries]
+        self.responses = [item["content"] for item in entries]
+        self.fingerprint = fingerprint
+        self._speller = None
+
+    @property
+    def speller(self) -> SpellingCorrector:
+        """Typo corrector over this model's vocabulary, built on first use."""
+        if self._speller is None:
+            self._speller = _build_speller(self)
+        return self._speller
+
+    @classmethod
+    def fit(cls, entries, fingerprint):
+        raise NotImplementedError
+
+    def encode(self, texts):
+        """Query representation for search() (the "transform" stage)."""
+        raise NotImplementedError
+
+    def search(self, encoded, k: int):
+        """Top-``k`` (indices, scores), each (n_queries x k), best first."""
+        raise NotImplementedError
+
+    def updated(self, entries):
+        """This model with rows added, removed or changed to match ``entries``."""
+        raise NotImplementedError
+
+    def save(self, path: str):
+        """Write the model to ``path`` atomically (build in a temp dir, then rename)."""
+        tmp = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        meta = self._write(tmp)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, **meta}, f)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)      # Another process won the race
+
+    @classmethod
+    def load(cls, path: str, entries, fingerprint):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["fingerprint"] != fingerprint:
+            raise ValueError(f"Stale model artifact at {path}")
+
+        def array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        return cls._read(array, meta, entries, fingerprint)
+
+
+def _corpus(entries):
+    # Combine keywords + content for richer matching
+    return [f"{item['keywords']} {item['content']}" for item in entries]
+
+
+def _build_speller(model: RetrievalModel) -> SpellingCorrector:
+    """Deletion index over the model's single words, weighted by corpus frequency."""
+    vocabulary, counts = model.vocabulary, {}
+    for text in model.corpus(model.entries):
+        for word in TOKEN_PATTERN.findall(text.lower()):
+            if word in vocabulary:
+                counts[word] = counts.get(word, 0) + 1
+    return SpellingCorrector(counts, ignore=model.stop_words)
+
+
+# ── TF-IDF ──────────────────────────────────────────────────────────────
+
+class TfidfModel(RetrievalModel):
+    """Fitted vectorizer and cosine-similarity index."""
+
+    name = "tfidf"
+    params = VECTORIZER_PARAMS
+
+    def __init__(self, entries, vectorizer, index, fingerprint):
+        super().__init__(entries, fingerprint)
+        self.vectorizer = vectorizer
+        self.index = index
+
+    @property
+    def vocabulary(self) -> dict:
+        return self.vectorizer.vocabulary_
+
+    @property
+    def stop_words(self) -> frozenset:
+        return self.vectorizer.stop_words
+
+    @classmethod
+    def fit(cls, entries, fingerprint):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(VECTORIZER_PARAMS)
+        if len(entries) < MIN_ENTRIES:
+            params["max_df"] = 1.0      # max_df=0.95 of one document keeps no terms at all
+        vectorizer = TfidfVectorizer(**params)
+        tfidf_matrix = vectorizer.fit_transform(_corpus(entries))
+        query_vectorizer = QueryVectorizer(
+            vectorizer.vocabulary_,
+            vectorizer.idf_,
+            vectorizer.get_stop_words() or (),
+            VECTORIZER_PARAMS["ngram_range"],
+        )
+        # Normalized once here, so each query is a dot product plus a top-k partition
+        return cls(entries, query_vectorizer, RetrievalIndex(tfidf_matrix), fingerprint)
+
+    def encode(self, texts):
+        return self.vectorizer.transform(texts)
+
+    def search(self, encoded, k: int):
+        return self.index.search(encoded, k)
+
+    def updated(self, entries):
+        """
+        Re-vectorize only the rows whose text changed, against the current
+        (fixed) vocabulary and idf weights; every other row is copied from
+        the live index.
+        """
+        current = {item["id"]: (row, text) for row, (item, text) in
+                   enumerate(zip(self.entries, _corpus(self.entries)))}
+        texts = _corpus(entries)
+        changed = [
+            i for i, (item, text) in enumerate(zip(entries, texts))
+            if current.get(item["id"], (None, None))[1] != text
+        ]
+        fresh = l2_normalize(self.vectorizer.transform([texts[i] for i in changed]))
+        fresh_rows = {i: n for n, i in enumerate(changed)}
+
+        matrix = self.index.matrix
+        rows = [
+            fresh[fresh_rows[i]] if i in fresh_rows else matrix[current[item["id"]][0]]
+            for i, item in enumerate(entries)
+        ]
+        matrix_t = sparse.vstack(rows, format="csr").T.tocsr()
+        return TfidfModel(entries, self.vectorizer, RetrievalIndex.from_transposed(matrix_t), None)
+
+    def _write(self, path: str) -> dict:
+        vocabulary = self.vectorizer.vocabulary_
+        terms = sorted(vocabulary, key=vocabulary.get)
+        matrix_t = self.index.matrix_t
+        np.save(os.path.join(path, "terms.npy"), np.array(terms))
+        np.save(os.path.join(path, "idf.npy"), self.vectorizer.idf_)
+        np.save(os.path.join(path, "stop_words.npy"), np.array(sorted(self.vectorizer.stop_words)))
+        np.save(os.path.join(path, "data.npy"), matrix_t.data)
+        np.save(os.path.join(path, "indices.npy"), matrix_t.indices)
+        np.save(os.path.join(path, "indptr.npy"), matrix_t.indptr)
+        return {"shape": list(matrix_t.shape)}
+
+    @classmethod
+    def _read(cls, array, meta, entries, fingerprint):
+        vectorizer = QueryVectorizer(
+            {str(term): i for i, term in enumerate(array("terms"))},
+            array("idf"),
+            (str(word) for word in array("stop_words")),
+            VECTORIZER_PARAMS["ngram_range"],
+        )
+        matrix_t = sparse.csr_matrix(
+            (array("data"), array("indices"), array("indptr")), shape=tuple(meta["shape"])
+        )
+        return cls(entries, vectorizer, RetrievalIndex.from_transposed(matrix_t), fingerprint)
+
+
+# ── BM25 ────────────────────────────────────────────────────────────────
+
+class Bm25Model(RetrievalModel):
+    """BM25 inverted index over the same analyzed text as the TF-IDF model."""
+
+    name = "bm25"
+    params = BM25_PARAMS
+    match_threshold = BM25_MATCH_THRESHOLD
+
+    def __init__(self, entries, index, stop_words, fingerprint):
+        super().__init__(entries, fingerprint)
+        self.index = index
+        self.stop_words = frozenset(stop_words)
+
+    @property
+    def vocabulary(self) -> dict:
+        return self.index.vocabulary
+
+    @staticmethod
+    def corpus(entries) -> list:
+        fields = BM25_PARAMS["fields"]
+        return [
+            " ".join(" ".join([item[field]] * times) for field, times in fields.items())
+            for item in entries
+        ]
+
+    def _analyze(self, text: str) -> list:
+        return analyze(text, self.stop_words, BM25_PARAMS["ngram_range"])
+
+    @classmethod
+    def fit(cls, entries, fingerprint, stop_words=None):
+        if stop_words is None:
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS as stop_words
+        model = cls(entries, None, stop_words, fingerprint)
+        model.index = bm25.Bm25Index.build(
+            [model._analyze(text) for text in cls.corpus(entries)],
+            BM25_PARAMS["k1"], BM25_PARAMS["b"],
+        )
+        return model
+
+    def encode(self, texts):
+        return self.index.encode(self._analyze(text) for text in texts)
+
+    def search(self, encoded, k: int):
+        return self.index.search(encoded, k)
+
+    def updated(self, entries):
+        # Document frequencies and the average length change with every edit,
+        # and a rebuild needs no scikit-learn, so rebuild the whole index
+        return Bm25Model.fit(entries, None, self.stop_words)
+
+    def _write(self, path: str) -> dict:
+        index = self.index
+        terms = sorted(index.vocabulary, key=index.vocabulary.get)
+        np.save(os.path.join(path, "terms.npy"), np.array(terms))
+        np.save(os.path.join(path, "idf.npy"), index.idf)
+        np.save(os.path.join(path, "stop_words.npy"), np.array(sorted(self.stop_words)))
+        np.save(os.path.join(path, "offsets.npy"), index.offsets)
+        np.save(os.path.join(path, "doc_ids.npy"), index.doc_ids)
+        np.save(os.path.join(path, "weights.npy"), index.weights)
+        return {"n_docs": index.n_docs, "k1": index.k1}
+
+    @classmethod
+    def _read(cls, array, meta, entries, fingerprint):
+        index = bm25.Bm25Index(
+            {str(term): i for i, term in enumerate(array("terms"))},
+            array("offsets"), array("doc_ids"), array("weights"), array("idf"),
+            meta["n_docs"], meta["k1"],
+        )
+        return cls(entries, index, (str(word) for word in array("stop_words")), fingerprint)
+
+
+ENGINES = {model.name: model for model in (TfidfModel, Bm25Model)}
+
+if CHATBOT_ENGINE not in ENGINES:
+    raise ValueError(f"CHATBOT_ENGINE must be one of {', '.join(ENGINES)}, not {CHATBOT_ENGINE!r}")
+
+
+def knowledge_fingerprint(entries, engine: str = None) -> str:
+    """Hash of everything the built model depends on."""
+    engine = engine or CHATBOT_ENGINE
+    payload = json.dumps(
+        {
+            "format": MODEL_FORMAT,
+            "engine": engine,
+            "params": ENGINES[engine].params,
+            "corpus": ENGINES[engine].corpus(entries),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_model(entries=None, engine: str = None) -> RetrievalModel:
+    """
+    Load the persisted ``engine`` model (default: CHATBOT_ENGINE) for
+    ``entries`` (default: the knowledge table), or build and persist it
+    when no artifact matches the current fingerprint.
+    """
+    entries = load_entries() if entries is None else entries
+    engine = engine or CHATBOT_ENGINE
+    model_cls = ENGINES[engine]
+    fingerprint = knowledge_fingerprint(entries, engine)
+    path = os.path.join(MODEL_DIR, f"{engine}-{fingerprint}")
+    if os.path.isdir(path):
+        try:
+            return model_cls.load(path, entries, fingerprint)
+        except (OSError, ValueError, KeyError):
+            log.warning("Ignoring unreadable model artifact at %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+
+    model = model_cls.fit(entries, fingerprint)
+    try:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        model.save(path)
+        _remove_stale_artifacts(engine, keep=path)
+    except OSError:
+        log.warning("Could not persist chatbot model to %s", path, exc_info=True)
+    return model
+
+
+def _remove_stale_artifacts(engine: str, keep: str):
+    # Other engines' artifacts stay, so switching CHATBOT_ENGINE back is a load, not a rebuild
+    for name in os.listdir(MODEL_DIR):
+        candidate = os.path.join(MODEL_DIR, name)
+        if name.startswith(f"{engine}-") and candidate != keep and ".tmp-" not in name:
+            shutil.rmtree(candidate, ignore_errors=True)
+
+
+MODEL_RETRY_DELAY = 30.0      # Seconds before retrying a model that failed to load
+
+
+class ModelUnavailable(RuntimeError):
+    """Raised by get_model() while the model cannot be loaded or built."""
+
+
+_model = None
+_model_lock = threading.Lock()
+_load_failed_at = None
+
+
+def get_model() -> RetrievalModel:
+    """
+    Return the loaded model, loading or building it on first use. A failure
+    raises ModelUnavailable, and so does every call for MODEL_RETRY_DELAY
+    seconds afterwards instead of rebuilding on each request.
+    """
+    global _load_failed_at
+    model = _model
+    if model is None:
+        with _model_lock:
+            model = _model
+            if model is None:
+                if _load_failed_at is not None and time.monotonic() - _load_failed_at < MODEL_RETRY_DELAY:
+                    raise ModelUnavailable("The chatbot model failed to load; retrying shortly")
+                try:
+                    model = _set_model(load_model())
+                except Exception as exc:
+                    _load_failed_at = time.monotonic()
+                    log.exception("Could not load the chatbot model")
+                    raise ModelUnavailable("The chatbot model failed to load") from exc
+    return model
+
+
+def _set_model(model):
+    global _model, _cache_epoch, _load_failed_at
+    model.speller       # Build the typo index before any query can reach the model
+    _model = model
+    _load_failed_at = None
+    _cache_epoch += 1       # Answers cached from the previous model are never served
+    _answer_cache.clear()
+    return model
+
+
+def warm_up() -> threading.Thread:
+    """
+    Load the model on a background thread so startup does not wait for it,
+    and start watching the knowledge table for edits made by other workers.
+    """
+    _watch_knowledge()
+    def load():
+        try:
+            get_model()
+        except ModelUnavailable:
+            pass            # Logged by get_model(); queries fall back until a refit succeeds
+
+    thread = threading.Thread(target=load, name="chatbot-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# ── Live edits ──────────────────────────────────────────────────────────
+#
+# An edit through the admin API is applied in two steps. First the live
+# model is updated in place of a full rebuild (model.updated(): TF-IDF
+# re-vectorizes only the changed rows against its fixed vocabulary, BM25
+# rebuilds its small index) and swapped in at once. Then a background refit
+# builds the model from scratch, persists the artifact and swaps again. A
+# swap replaces the whole model reference and get_answers() keeps the
+# reference it started with, so in-flight queries finish on the old model
+# and never see a half-built index.
+
+#
+# With several worker processes (serve.py --workers N) an edit reaches only
+# the worker that handled it, so every worker also polls the knowledge
+# table's version counter (bumped by a trigger on each write) and applies
+# changes it has not seen within KNOWLEDGE_POLL_INTERVAL seconds.
+
+REFIT_DELAY = 1.0     # Seconds to wait for more edits before refitting
+KNOWLEDGE_POLL_INTERVAL = float(os.environ.get("KNOWLEDGE_POLL_INTERVAL", 2.0))
+
+_edits = 0
+_refit_wanted = threading.Event()
+_refit_thread = None
+_applied_version = None     # Knowledge version the live model reflects
+_watch_thread = None
+
+
+def apply_knowledge_change():
+    """
+    Bring the chatbot in line with the knowledge table after an edit: swap in
+    an incrementally updated index now and schedule a full refit.
+    """
+    global _edits, _applied_version
+    version = knowledge.load_version()      # Read first: a later edit is seen again, never missed
+    entries = load_entries()
+    with _model_lock:
+        _edits += 1
+        _applied_version = version
+        if _model is not None:
+            _set_model(_model.updated(entries))
+    _schedule_refit()
+
+
+def _schedule_refit():
+    global _refit_thread
+    _refit_wanted.set()
+    with _model_lock:
+        if _refit_thread is None:
+            _refit_thread = threading.Thread(target=_refit_loop, name="chatbot-refit", daemon=True)
+            _refit_thread.start()
+
+
+def _watch_knowledge():
+    global _applied_version, _watch_thread
+    with _model_lock:
+        if _watch_thread is not None:
+            return
+        if _applied_version is None:
+            _applied_version = knowledge.load_version()     # Before the model reads any entries
+        _watch_thread = threading.Thread(target=_watch_loop, name="chatbot-knowledge-watch", daemon=True)
+        _watch_thread.start()
+
+
+def _watch_loop():
+    while True:
+        time.sleep(KNOWLEDGE_POLL_INTERVAL)
+        try:
+            if knowledge.load_version() != _applied_version:
+                apply_knowledge_change()
+        except Exception:
+            log.exception("Knowledge version check failed; will retry")
+
+
+def _refit_loop():
+    while True:
+        _refit_wanted.wait()
+        time.sleep(REFIT_DELAY)         # Coalesce bursts of edits into one refit
+        _refit_wanted.clear()
+        edits = _edits
+        try:
+            refitted = load_model()
+        except Exception:
+            log.exception("Chatbot refit failed; keeping the incrementally updated model")
+            continue
+        with _model_lock:
+            if edits == _edits:         # Otherwise a newer edit queued another refit
+                _set_model(refitted)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -304,70 +663,412 @@ FALLBACK_RESPONSES = [
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 5. MAIN ANSWER FUNCTION
+# 5. ANSWER CACHE — keyed on a normalized query
 # ═══════════════════════════════════════════════════════════════════════════
 
-def get_answer(query: str) -> dict:
+# Cached entries are resolved answers whose "answer" may still be a list of
+# variants (greetings, fallbacks); _render() picks one per request, so the
+# cache never freezes a single random reply. Keys are (normalized query,
+# compose flag, cache epoch): composed and single-section answers differ, and
+# a query still running on a model that was just swapped out caches its
+# answer under the old epoch, where no later lookup will find it.
+ANSWER_CACHE_SIZE = 1024
+ANSWER_CACHE_TTL = 3600.0     # Seconds
+
+_answer_cache = LRUCache(maxsize=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL)
+_cache_epoch = 0              # Part of every key; bumped when the model is swapped
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+_REPEATED_PUNCT = re.compile(r"([^\w\s'])\1+")
+_TRAILING_PUNCT = " !?."
+
+
+def normalize_query(query: str) -> str:
     """
-    Process a user query through the intent pipeline:
-      1. Empty check
-      2. Greeting detection
-      3. Small talk detection
-      4. TF-IDF similarity matching
-      5. Fallback response
+    Cache key for a query: lowercased, whitespace runs collapsed to one
+    space, repeated punctuation ("!!!", "??") collapsed to one character and
+    trailing spaces / "!?." stripped. Every step is one the intent patterns
+    and the TF-IDF tokenizer already ignore, so queries sharing a key always
+    resolve to the same answer.
     """
-    # ── Step 1: Empty input ─────────────────────────────────────────────
-    if not query or not query.strip():
-        return {
-            "section": "👋 Welcome",
-            "answer": random.choice(GREETING_RESPONSES),
-            "confidence": 1.0,
-            "intent": "greeting",
-        }
+    key = _WHITESPACE_RUN.sub(" ", query.lower())
+    key = _REPEATED_PUNCT.sub(r"\1", key)
+    return key.lstrip().rstrip(_TRAILING_PUNCT)
+
+
+def cache_stats() -> dict:
+    """Hit, miss and eviction counters for the answer cache."""
+    return _answer_cache.stats()
+
+
+def clear_cache():
+    _answer_cache.clear()
 
-    cleaned = query.strip()
+
+def _render(resolved: dict) -> dict:
+    answer = resolved["answer"]
+    if isinstance(answer, list):
+        return {**resolved, "answer": random.choice(answer)}
+    return dict(resolved)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 6. MAIN ANSWER FUNCTIONS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _match_intent(cleaned: str):
+    """Run the regex stages (greeting, small talk); None means go to retrieval."""
+    intent = INTENT_ROUTER.route(cleaned)
+    if intent is None:
+        return None
 
     # ── Step 2: Greeting detection ──────────────────────────────────────
-    if GREETING_PATTERNS.match(cleaned):
+    if intent == "greeting":
         return {
             "section": "👋 Hello!",
-            "answer": random.choice(GREETING_RESPONSES),
+            "answer": GREETING_RESPONSES,
             "confidence": 1.0,
             "intent": "greeting",
         }
 
     # ── Step 3: Small talk detection ────────────────────────────────────
-    for pattern, response in SMALLTALK_PATTERNS.items():
-        if pattern.search(cleaned):
-            return {
-                "section": "💬 Chat",
-                "answer": response,
-                "confidence": 1.0,
-                "intent": "smalltalk",
-            }
-
-    # ── Step 4: TF-IDF similarity match ─────────────────────────────────
-    query_vec = _vectorizer.transform([cleaned])
-    similarities = cosine_similarity(query_vec, _tfidf_matrix).flatten()
+    return {
+        "section": "💬 Chat",
+        "answer": _SMALLTALK_RESPONSES[intent],
+        "confidence": 1.0,
+        "intent": "smalltalk",
+    }
 
-    # Get top 2 matches for potential multi-section answers
-    top_indices = np.argsort(similarities)[::-1][:2]
-    best_idx = int(top_indices[0])
-    best_score = float(similarities[best_idx])
 
+def _domain_response(model: RetrievalModel, best_idx: int, best_score: float) -> dict:
     # High confidence — return the best match
-    if best_score >= 0.08:
+    if best_score >= model.match_threshold:
         return {
-            "section": f"📌 {_labels[best_idx]}",
-            "answer": _responses[best_idx],
+            "section": f"📌 {model.labels[best_idx]}",
+            "answer": model.responses[best_idx],
             "confidence": round(float(best_score), 4),
             "intent": "domain_query",
         }
 
     # ── Step 5: Fallback ────────────────────────────────────────────────
+    return _fallback_response(best_score)
+
+
+def _fallback_response(score: float) -> dict:
     return {
         "section": "🤔 Hmm...",
-        "answer": random.choice(FALLBACK_RESPONSES),
-        "confidence": round(float(best_score), 4),
+        "answer": FALLBACK_RESPONSES,
+        "confidence": round(float(score), 4),
         "intent": "fallback",
     }
+
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def _compose_response(model: RetrievalModel, indices, scores, keep) -> dict:
+    """
+    Multi-section answer from one query's ranked matches. ``keep`` marks the
+    matches within the margin of the best one (see _compose_keep()).
+    """
+    sections = list(_compose_sections(model, indices, scores, keep)) if keep[0] else []
+    if not sections:        # Best match below the threshold, or blank text
+        return _domain_response(model, int(indices[0]), float(scores[0]))
+    return _join_sections(sections)
+
+
+def _compose_keep(model: RetrievalModel, top_scores):
+    """Matches (per row of ``top_scores``) close enough to the best to be composed."""
+    return (top_scores >= model.match_threshold) & (
+        top_scores >= top_scores[..., :1] * (1 - COMPOSE_MARGIN)
+    )
+
+
+def _compose_sections(model: RetrievalModel, indices, scores, keep):
+    """
+    Yield the sections of a composed answer one at a time. Lines already
+    shown by a higher-ranked section are dropped, and a section that no
+    longer fits the length budget is skipped; the best match is always
+    included.
+    """
+    seen, length, count = set(), 0, 0
+    for idx, score, kept in zip(indices.tolist(), scores.tolist(), keep.tolist()):
+        if not kept:
+            break
+        lines = [
+            line for line in model.responses[idx].splitlines()
+            if not line.strip() or line.strip() not in seen
+        ]
+        text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+        if not text:
+            continue
+
+        heading = f"📌 {model.labels[idx]}"
+        cost = len(text) + (len(heading) + 3 if count else 0)
+        if count and length + cost > COMPOSE_MAX_CHARS:
+            continue
+
+        seen.update(line.strip() for line in lines if line.strip())
+        length += cost
+        count += 1
+        yield {"section": heading, "answer": text, "confidence": round(score, 4)}
+
+
+def _join_sections(sections: list) -> dict:
+    answer = "\n\n".join(
+        [sections[0]["answer"]]
+        + [f"{s['section']}\n{s['answer']}" for s in sections[1:]]
+    )
+    return {
+        "section": sections[0]["section"],
+        "answer": answer,
+        "confidence": sections[0]["confidence"],
+        "intent": "domain_query",
+        "sections": sections,
+    }
+
+
+# Per-call stage timings and the intent / confidence mix of every answer
+# (see metrics.py)
+_CACHE_STAGE = metrics.CHATBOT_STAGE.labels("cache")
+_INTENT_STAGE = metrics.CHATBOT_STAGE.labels("intent")
+_SPELLING_STAGE = metrics.CHATBOT_STAGE.labels("spelling")
+_TRANSFORM_STAGE = metrics.CHATBOT_STAGE.labels("transform")
+_SEARCH_STAGE = metrics.CHATBOT_STAGE.labels("similarity")
+_SCORED_INTENTS = ("domain_query", "fallback")
+
+
+def _record(resolved: list, cache_time: float, intent_time: float):
+    _CACHE_STAGE.observe(cache_time)
+    if intent_time:
+        _INTENT_STAGE.observe(intent_time)
+    for intent, count in Counter(r["intent"] for r in resolved).items():
+        metrics.CHATBOT_ANSWERS.labels(intent).inc(count)
+    for r in resolved:
+        if r["intent"] in _SCORED_INTENTS:
+            metrics.CHATBOT_CONFIDENCE.labels(r["intent"]).observe(r["confidence"])
+
+
+def iter_sections(answer: dict):
+    """
+    Yield an answer section by section (heading, text, confidence), e.g. to
+    stream it. Answers that were not composed are a single section.
+    """
+    if "sections" in answer:
+        yield from answer["sections"]
+    else:
+        yield {
+            "section": answer["section"],
+            "answer": answer["answer"],
+            "confidence": answer["confidence"],
+        }
+
+
+def _route_query(query: str, compose: bool, epoch: int, timings: list):
+    """
+    Steps 1-3 for one query: ``(answer, cache key)``, where the answer comes
+    from the cache or the regex stages and is None when the query needs
+    retrieval. ``timings`` accumulates [cache, intent] stage seconds.
+    """
+    # ── Step 1: Empty input ─────────────────────────────────────────────
+    if not query or not query.strip():
+        return {
+            "section": "👋 Welcome",
+            "answer": GREETING_RESPONSES,
+            "confidence": 1.0,
+            "intent": "greeting",
+        }, None
+
+    started = time.perf_counter()
+    key = (normalize_query(query), compose, epoch)
+    cached = _answer_cache.get(key)
+    routed = time.perf_counter()
+    timings[0] += routed - started
+    if cached is not None:
+        return cached, key
+
+    matched = _match_intent(query.strip())
+    timings[1] += time.perf_counter() - routed
+    if matched is not None:
+        _answer_cache.put(key, matched)
+    return matched, key
+
+
+def _search(model: RetrievalModel, texts: list):
+    """Top-k ``(indices, scores)`` of each text; composed answers use the runners-up."""
+    # Unknown words ("projcts") are rewritten to the closest known word
+    # first, so they still reach the vocabulary
+    speller = model.speller
+    with _SPELLING_STAGE.time():
+        texts = [speller.correct(text) for text in texts]
+
+    with _TRANSFORM_STAGE.time():
+        encoded = model.encode(texts)
+
+    with _SEARCH_STAGE.time():
+        return model.search(encoded, TOP_K)
+
+
+def get_answers(queries: list, compose: bool = False) -> list:
+    """
+    Answer many queries in one call, e.g. for offline evaluation or replaying
+    logged traffic. Each query goes through the same pipeline as get_answer(),
+    but the regex stages run over the whole list first and every query that
+    reaches Step 4 is vectorized into one sparse matrix and scored against
+    the retrieval index with a single sparse product.
+
+    Queries seen recently (by normalize_query() key) are served from the
+    answer cache and skip every stage.
+    """
+    resolved = [None] * len(queries)
+    pending, texts, keys = [], [], []
+    epoch = _cache_epoch
+    timings = [0.0, 0.0]
+
+    for i, query in enumerate(queries):
+        resolved[i], key = _route_query(query, compose, epoch, timings)
+        if resolved[i] is None:
+            pending.append(i)
+            texts.append(query.strip())
+            keys.append(key)
+
+    if pending:
+        # ── Step 4: Retrieval match (whole batch at once) ───────────────
+        try:
+            model = get_model()
+        except ModelUnavailable:
+            # Nothing to match against: fall back, and cache nothing so the
+            # queries are answered properly once the model is back
+            for i in pending:
+                resolved[i] = _fallback_response(0.0)
+            pending = []
+
+    if pending:
+        top_indices, top_scores = _search(model, texts)
+        if compose:
+            keep = _compose_keep(model, top_scores)
+        for row, i in enumerate(pending):
+            if compose:
+                resolved[i] = _compose_response(
+                    model, top_indices[row], top_scores[row], keep[row]
+                )
+            else:
+                resolved[i] = _domain_response(
+                    model, int(top_indices[row, 0]), float(top_scores[row, 0])
+                )
+            _answer_cache.put(keys[row], resolved[i])
+
+    _record(resolved, *timings)
+    return [_render(r) for r in resolved]
+
+
+def get_answer(query: str, compose: bool = False) -> dict:
+    """
+    Process a user query through the intent pipeline:
+      1. Empty check
+      2. Greeting detection
+      3. Small talk detection
+      4. TF-IDF / BM25 retrieval (several sections when ``compose``)
+      5. Fallback response
+    """
+    return get_answers([query], compose)[0]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 7. STREAMING — newline-delimited JSON events
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# A streamed answer is a "meta" event (first section heading, intent and
+# confidence), then the text in "chunk" events of at most STREAM_CHUNK_CHARS
+# characters, with a "section" event before each further section of a
+# composed answer, and a final "done" event. stream_events() yields "meta" as
+# soon as the intent and the best match are known and composes the other
+# sections while streaming, so clients can render the heading before the
+# rest of the answer exists.
+
+STREAM_CHUNK_CHARS = 160
+
+
+def _chunk_events(text: str):
+    for start in range(0, len(text), STREAM_CHUNK_CHARS):
+        yield {"event": "chunk", "text": text[start:start + STREAM_CHUNK_CHARS]}
+
+
+def answer_events(answer: dict):
+    """Yield a resolved answer (from get_answer()) as a sequence of event dicts."""
+    yield {
+        "event": "meta",
+        "section": answer["section"],
+        "intent": answer["intent"],
+        "confidence": answer["confidence"],
+    }
+    for n, section in enumerate(iter_sections(answer)):
+        if n:
+            yield {
+                "event": "section",
+                "section": section["section"],
+                "confidence": section["confidence"],
+            }
+        yield from _chunk_events(section["answer"])
+    yield {"event": "done"}
+
+
+def stream_events(query: str, compose: bool = False):
+    """
+    The events of get_answer(query, compose), produced lazily: the first
+    next() runs Steps 1-4 up to the best match and yields "meta"; each later
+    section of a composed answer is built when the stream reaches it. The
+    answer is cached once the stream completes.
+    """
+    timings = [0.0, 0.0]
+    resolved, key = _route_query(query, compose, _cache_epoch, timings)
+    if resolved is None:
+        try:
+            model = get_model()
+        except ModelUnavailable:
+            resolved = _fallback_response(0.0)
+        else:
+            top_indices, top_scores = _search(model, [query.strip()])
+            indices, scores = top_indices[0], top_scores[0]
+            keep = _compose_keep(model, scores)
+            if compose and keep[0]:
+                sections = []
+                for section in _compose_sections(model, indices, scores, keep):
+                    if sections:
+                        yield {
+                            "event": "section",
+                            "section": section["section"],
+                            "confidence": section["confidence"],
+                        }
+                    else:
+                        yield {
+                            "event": "meta",
+                            "section": section["section"],
+                            "intent": "domain_query",
+                            "confidence": section["confidence"],
+                        }
+                    sections.append(section)
+                    yield from _chunk_events(section["answer"])
+                if sections:
+                    resolved = _join_sections(sections)
+                    _answer_cache.put(key, resolved)
+                    _record([resolved], *timings)
+                    yield {"event": "done"}
+                    return
+
+            resolved = _domain_response(model, int(indices[0]), float(scores[0]))
+            _answer_cache.put(key, resolved)
+
+    _record([resolved], *timings)
+    yield from answer_events(_render(resolved))
+
+
+def encode_event(event: dict) -> bytes:
+    """One NDJSON line."""
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def stream_answer(answer: dict):
+    """answer_events() encoded as NDJSON, one line per event."""
+    for event in answer_events(answer):
+        yield encode_event(event)
@@ -0,0 +1,139 @@
+"""
+concurrency.py
+--------------
+Concurrency budgets for the API's route classes.
+
+Route handlers are async. Database routes await the aiosqlite pool, and
+CPU-bound chatbot work (vectorizing and scoring queries, applying knowledge
+edits) runs on a dedicated pool of CHATBOT_WORKERS threads rather than the
+framework's shared threadpool. On top of that, each route class has a cap
+on requests in progress (ROUTE_LIMITS). A request over the cap waits up to
+QUEUE_TIMEOUT seconds for a slot and is then refused, so a burst of chatbot
+traffic queues behind its own limit instead of delaying /api/projects.
+Streamed exports hold a pooled connection until they finish, so they have
+their own, smaller cap (see stream()).
+
+All sizes can be overridden with environment variables.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+CHATBOT_WORKERS = _env_int("CHATBOT_WORKERS", min(4, os.cpu_count() or 1))
+
+# Chatbot requests still cost event-loop time (parsing, serializing) while a
+# worker answers them, so the cap stays a small multiple of the workers
+ROUTE_LIMITS = {
+    "chatbot": _env_int("CHATBOT_CONCURRENCY", 4 * CHATBOT_WORKERS),
+    "db": _env_int("DB_CONCURRENCY", 16),     # Twice the aiosqlite pool size
+    "export": _env_int("EXPORT_CONCURRENCY", 2),  # Each holds a connection throughout
+}
+QUEUE_TIMEOUT = float(os.environ.get("ROUTE_QUEUE_TIMEOUT", 5.0))   # Seconds
+
+
+class Overloaded(RuntimeError):
+    """Raised when a request waited QUEUE_TIMEOUT for a slot in its route class."""
+
+    def __init__(self, route_class: str):
+        super().__init__(f"Too many concurrent {route_class} requests")
+        self.route_class = route_class
+
+
+class RouteLimiter:
+    """At most ``limit`` requests of one route class in progress at once."""
+
+    def __init__(self, name: str, limit: int, timeout: float = QUEUE_TIMEOUT):
+        self.name = name
+        self.limit = limit
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded(self.name) from None
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._slots.release()
+
+
+_limiters = {}
+_chatbot_executor = None
+
+
+def limit(route_class: str) -> RouteLimiter:
+    """
+    Slot in ``route_class``'s budget, as an async context manager:
+
+        async with limit("db"):
+            ...
+    """
+    limiter = _limiters.get(route_class)
+    if limiter is None:
+        limiter = _limiters[route_class] = RouteLimiter(route_class, ROUTE_LIMITS[route_class])
+    return limiter
+
+
+async def stream(route_class: str, chunks):
+    """
+    Start the async generator ``chunks`` within ``route_class``'s budget and
+    return an iterator over all of its chunks. The slot is held until the
+    stream ends or is closed. The first chunk is awaited here, so a failure
+    before it (Overloaded, database.PoolTimeout) reaches the exception
+    handlers instead of breaking a response already under way.
+    """
+    limiter = limit(route_class)
+    await limiter.__aenter__()
+    held = _holding(limiter, chunks)
+    try:
+        first = await held.__anext__()
+    except StopAsyncIteration:
+        first = None
+    return _prepend(first, held)
+
+
+async def _holding(limiter: RouteLimiter, chunks):
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+        await limiter.__aexit__(None, None, None)
+
+
+async def _prepend(first, rest):
+    if first is not None:
+        yield first
+    async for chunk in rest:
+        yield chunk
+
+
+def chatbot_executor() -> ThreadPoolExecutor:
+    global _chatbot_executor
+    if _chatbot_executor is None:
+        _chatbot_executor = ThreadPoolExecutor(CHATBOT_WORKERS, thread_name_prefix="chatbot")
+    return _chatbot_executor
+
+
+async def run_chatbot(fn, *args):
+    """Run ``fn(*args)`` on the chatbot executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(chatbot_executor(), functools.partial(fn, *args))
+
+
+def shutdown():
+    """Stop the chatbot executor and forget the limiters (bound to this event loop)."""
+    global _chatbot_executor
+    executor, _chatbot_executor = _chatbot_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    _limiters.clear()
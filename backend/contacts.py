@@ -0,0 +1,300 @@
+"""
+contacts.py
+-----------
+Contact form submissions: batched ingestion and the admin inbox listing.
+
+POST /api/contact only enqueues the message on a bounded in-process queue;
+a background writer drains it and commits up to BATCH_SIZE messages per
+transaction. When the queue is full, ``submit()`` refuses the message so
+the route can answer 429 instead of piling up work. On shutdown the writer
+drains whatever is still queued.
+
+The inbox is read newest-first with keyset pagination on (created_at, id),
+backed by the idx_contacts_* indexes, or exported as a stream that pulls
+rows from an open cursor in EXPORT_CHUNK batches. Both are async and read
+through the aiosqlite pool.
+"""
+
+import base64
+import csv
+import io
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from analytics import parse_timestamp
+from database import async_connection, get_async_pool, get_connection
+
+QUEUE_SIZE = 1000             # Messages buffered before submissions are refused
+BATCH_SIZE = 100              # Max messages committed per transaction
+FLUSH_INTERVAL = 0.5          # Seconds the writer waits to fill a batch
+
+log = logging.getLogger(__name__)
+
+
+class ContactQueue:
+    """Bounded queue of contact messages with a single batching writer thread."""
+
+    def __init__(self, maxsize=QUEUE_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._retry = []                # Batch whose commit failed, written first next time
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._accepted = 0
+        self._rejected = 0
+        self._written = 0
+        self._batches = 0
+        self._failures = 0
+        self._flush_total = 0.0
+        self._flush_last = 0.0
+        self._flush_max = 0.0
+
+    # ── Hot path ────────────────────────────────────────────────────────
+
+    def submit(self, name: str, email: str, message: str) -> bool:
+        """Enqueue a message; returns False when the queue is full."""
+        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self._queue.put_nowait((name, email, message, created_at))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            return False
+        with self._stats_lock:
+            self._accepted += 1
+        return True
+
+    # ── Writer ──────────────────────────────────────────────────────────
+
+    def _next_batch(self, timeout):
+        batch, self._retry = self._retry, []
+        if not batch:
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            with get_connection() as conn:
+                conn.executemany(
+                    "INSERT INTO contacts (name, email, message, created_at) VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+        except Exception:
+            self._retry = batch
+            with self._stats_lock:
+                self._failures += 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._written += len(batch)
+            self._batches += 1
+            self._flush_total += elapsed
+            self._flush_last = elapsed
+            self._flush_max = max(self._flush_max, elapsed)
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch(self.flush_interval)
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception:
+                log.exception("Contact batch of %d failed; will retry", len(batch))
+                self._stop.wait(self.flush_interval)
+
+    def drain(self):
+        """Write everything queued right now from the calling thread."""
+        while True:
+            batch = self._next_batch(timeout=0)
+            if not batch:
+                return
+            self._write(batch)
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="contact-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the writer and commit every message still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.drain()
+
+    # ── Metrics ─────────────────────────────────────────────────────────
+
+    def metrics(self) -> dict:
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                "queue_depth": self._queue.qsize() + len(self._retry),
+                "queue_capacity": self._queue.maxsize,
+                "accepted": self._accepted,
+                "rejected": self._rejected,
+                "written": self._written,
+                "batches": batches,
+                "failed_batches": self._failures,
+                "flush_latency_ms": {
+                    "last": round(self._flush_last * 1000, 3),
+                    "avg": round(self._flush_total / batches * 1000, 3) if batches else 0.0,
+                    "max": round(self._flush_max * 1000, 3),
+                },
+            }
+
+
+contact_queue = ContactQueue()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Inbox listing
+# ═══════════════════════════════════════════════════════════════════════════
+
+EXPORT_CHUNK = 500            # Rows fetched and serialized per streamed chunk
+CONTACT_COLUMNS = ("id", "name", "email", "message", "created_at")
+
+
+def encode_cursor(created_at: str, contact_id: int) -> str:
+    raw = json.dumps([created_at, contact_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of encode_cursor(); raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, contact_id = json.loads(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(created_at, str) or type(contact_id) is not int:
+        raise ValueError("Invalid cursor")
+    if not 0 <= contact_id < 2**63:       # Would overflow a SQLite integer
+        raise ValueError("Invalid cursor")
+    return created_at, contact_id
+
+
+def _sql_time(value: str) -> str:
+    """Convert an ISO 8601 / Unix timestamp to SQLite's datetime('now') format."""
+    ts = parse_timestamp(value)
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _filters(email=None, since=None, until=None):
+    clauses, params = [], []
+    if email:
+        clauses.append("email = ?")
+        params.append(email)
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(_sql_time(since))
+    if until:
+        clauses.append("created_at < ?")
+        params.append(_sql_time(until))
+    return clauses, params
+
+
+async def list_page(limit: int, cursor=None, email=None, since=None, until=None):
+    """
+    One page of the inbox, newest first. Returns ``(rows, next_cursor)``;
+    ``next_cursor`` is None on the last page. Raises ValueError on bad input.
+    """
+    clauses, params = _filters(email, since, until)
+    if cursor:
+        clauses.append("(created_at, id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    async with async_connection() as conn:
+        cur = await conn.execute(
+            f"SELECT * FROM contacts {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1),
+        )
+        rows = [dict(r) for r in await cur.fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+async def _iter_rows(email=None, since=None, until=None):
+    """Yield lists of rows from one open cursor; the connection is held until exhausted."""
+    clauses, params = _filters(email, since, until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    pool = get_async_pool()
+    conn = await pool.acquire()
+    try:
+        cur = await conn.execute(
+            f"SELECT {', '.join(CONTACT_COLUMNS)} FROM contacts {where} "
+            "ORDER BY created_at DESC, id DESC",
+            params,
+        )
+        while True:
+            rows = await cur.fetchmany(EXPORT_CHUNK)
+            if not rows:
+                return
+            yield rows
+    finally:
+        await pool.release(conn)
+
+
+def export_ndjson(email=None, since=None, until=None):
+    """Stream the filtered inbox as newline-delimited JSON."""
+    _filters(email, since, until)   # Validate before the response starts
+    return _ndjson_chunks(email, since, until)
+
+
+async def _ndjson_chunks(email, since, until):
+    async for rows in _iter_rows(email, since, until):
+        yield "".join(
+            json.dumps(dict(zip(CONTACT_COLUMNS, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+# Spreadsheets evaluate a cell starting with one of these as a formula;
+# exported cells that do are prefixed with a quote so they stay text
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_csv(email=None, since=None, until=None):
+    """Stream the filtered inbox as CSV with a header row; form fields are never formulas."""
+    _filters(email, since, until)
+    return _csv_chunks(email, since, until)
+
+
+async def _csv_chunks(email, since, until):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CONTACT_COLUMNS)
+    async for rows in _iter_rows(email, since, until):
+        writer.writerows([_csv_cell(value) for value in row] for row in rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
@@ -0,0 +1,353 @@
+"""
+content.py
+----------
+Precomputed read model for the portfolio content endpoints
+(/api/projects, /api/experience, /api/skills).
+
+The content tables only change when they are seeded or edited, so the
+decoded response objects and their serialized JSON bytes are built once
+and served straight from memory. Call ``invalidate()`` after writing to a
+content table; the next read rebuilds the snapshot.
+
+Each body is also kept pre-compressed (gzip, and brotli when the optional
+``brotli`` package is installed) with a strong ETag per representation, so
+``respond()`` can answer conditional requests with 304 and never compresses
+on the request path.
+
+A snapshot can be saved once with ``save_snapshot()`` (serve.py does this
+before starting workers) and opened by every worker with ``load_snapshot()``:
+the encoded bodies stay in one memory-mapped file shared through the page
+cache, workers skip the compression work at startup, and all of them send
+the same Last-Modified.
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import logging
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+import metrics
+from database import get_connection
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip-only when brotli is not installed
+    brotli = None
+
+CONTENT_KEYS = ("projects", "experience", "skills")
+
+# Saved snapshot for workers to open at startup (set by serve.py)
+SNAPSHOT_PATH = os.environ.get("CONTENT_SNAPSHOT_PATH")
+
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+MIN_COMPRESS_SIZE = 256       # Bytes; smaller bodies are sent as-is
+
+log = logging.getLogger(__name__)
+
+
+# ── Row decoders ────────────────────────────────────────────────────────────
+
+def _load_projects(conn):
+    rows = conn.execute("SELECT * FROM projects ORDER BY sort_order").fetchall()
+    return [
+        {
+            "id": r["id"],
+            "title": r["title"],
+            "description": r["description"],
+            "tech_stack": json.loads(r["tech_stack"]),
+            "image_url": r["image_url"],
+            "github_url": r["github_url"],
+        }
+        for r in rows
+    ]
+
+
+def _load_experience(conn):
+    rows = conn.execute("SELECT * FROM experience ORDER BY sort_order").fetchall()
+    return [
+        {
+            "id": r["id"],
+            "role": r["role"],
+            "company": r["company"],
+            "period": r["period"],
+            "description": json.loads(r["description"]),
+        }
+        for r in rows
+    ]
+
+
+def _load_skills(conn):
+    rows = conn.execute("SELECT * FROM skills").fetchall()
+    return [
+        {
+            "id": r["id"],
+            "category": r["category"],
+            "items": json.loads(r["items"]),
+        }
+        for r in rows
+    ]
+
+
+_LOADERS = {
+    "projects": _load_projects,
+    "experience": _load_experience,
+    "skills": _load_skills,
+}
+
+
+def _encode(obj) -> bytes:
+    """Serialize exactly like FastAPI's default JSONResponse."""
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+# ── Representations ─────────────────────────────────────────────────────────
+
+class Representation:
+    """One response body in every content-coding we serve, with strong ETags."""
+
+    __slots__ = ("encodings", "etags")
+
+    def __init__(self, body: bytes):
+        tag = hashlib.sha256(body).hexdigest()[:16]
+        self.encodings = {"identity": body}
+        self.etags = {"identity": f'"{tag}"'}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.encodings["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            self.etags["gzip"] = f'"{tag}-gzip"'
+            if brotli is not None:
+                self.encodings["br"] = brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+                self.etags["br"] = f'"{tag}-br"'
+
+    @classmethod
+    def from_encoded(cls, encodings: dict, etags: dict):
+        """Wrap bodies that were encoded earlier (e.g. views of a saved snapshot)."""
+        rep = cls.__new__(cls)
+        rep.encodings = encodings
+        rep.etags = etags
+        return rep
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """Pick the smallest acceptable coding for an Accept-Encoding header."""
+        accepted = _parse_accept_encoding(accept_encoding)
+        best = "identity"
+        for coding in ("gzip", "br"):
+            if coding in self.encodings and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+                if len(self.encodings[coding]) < len(self.encodings[best]):
+                    best = coding
+        return best
+
+    def matches(self, if_none_match: str) -> bool:
+        """Weak comparison (RFC 9110 §13.1.2) against any of our codings."""
+        if if_none_match.strip() == "*":
+            return True
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return not tags.isdisjoint(self.etags.values())
+
+
+def _parse_accept_encoding(header: str) -> dict:
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+# ── Snapshot ────────────────────────────────────────────────────────────────
+
+class ContentSnapshot:
+    """Immutable view of all content: decoded objects plus encoded bodies."""
+
+    __slots__ = ("data", "bodies", "representations", "version", "last_modified")
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.bodies = {key: _encode(value) for key, value in data.items()}
+        self.representations = {key: Representation(body) for key, body in self.bodies.items()}
+        digest = hashlib.sha256()
+        for key in CONTENT_KEYS:
+            digest.update(self.bodies[key])
+        self.version = digest.hexdigest()[:16]
+        self.last_modified = formatdate(int(time.time()), usegmt=True)
+
+
+# ── Saved snapshots ─────────────────────────────────────────────────────────
+#
+# A saved snapshot is a directory content-<version>/ holding bodies.bin (every
+# encoded body back to back) and meta.json (offsets, ETags, Last-Modified).
+
+def save_snapshot(snapshot: ContentSnapshot, directory: str) -> str:
+    """Write ``snapshot`` under ``directory`` atomically and return its path."""
+    path = os.path.join(directory, f"content-{snapshot.version}")
+    if os.path.isdir(path):
+        return path
+    tmp = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    offsets = {}
+    with open(os.path.join(tmp, "bodies.bin"), "wb") as f:
+        for key in CONTENT_KEYS:
+            offsets[key] = {}
+            for coding, body in snapshot.representations[key].encodings.items():
+                offsets[key][coding] = [f.tell(), len(body)]
+                f.write(body)
+    meta = {
+        "version": snapshot.version,
+        "last_modified": snapshot.last_modified,
+        "offsets": offsets,
+        "etags": {key: snapshot.representations[key].etags for key in CONTENT_KEYS},
+    }
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)      # Another process won the race
+    return path
+
+
+def load_snapshot(path: str) -> ContentSnapshot:
+    """Open a saved snapshot; bodies are served from a read-only memory map."""
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(os.path.join(path, "bodies.bin"), "rb") as f:
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    snapshot = ContentSnapshot.__new__(ContentSnapshot)
+    snapshot.representations = {
+        key: Representation.from_encoded(
+            {coding: view[start:start + size] for coding, (start, size) in codings.items()},
+            meta["etags"][key],
+        )
+        for key, codings in meta["offsets"].items()
+    }
+    snapshot.bodies = {key: rep.encodings["identity"] for key, rep in snapshot.representations.items()}
+    snapshot.data = {key: json.loads(bytes(body)) for key, body in snapshot.bodies.items()}
+    snapshot.version = meta["version"]
+    snapshot.last_modified = meta["last_modified"]
+    return snapshot
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def build_snapshot() -> ContentSnapshot:
+    """Read every content table in one connection and decode it."""
+    with metrics.CONTENT_BUILD.labels("decode").time():
+        with get_connection() as conn:
+            data = {key: _LOADERS[key](conn) for key in CONTENT_KEYS}
+    with metrics.CONTENT_BUILD.labels("encode").time():
+        return ContentSnapshot(data)
+
+
+def get_snapshot() -> ContentSnapshot:
+    """Return the current snapshot, building it on first use or after invalidation."""
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            snapshot = _snapshot or _swap(build_snapshot())
+    return snapshot
+
+
+def _swap(snapshot):
+    global _snapshot
+    _snapshot = snapshot
+    return snapshot
+
+
+def refresh() -> ContentSnapshot:
+    """Rebuild the snapshot now and publish it atomically."""
+    with _lock:
+        return _swap(build_snapshot())
+
+
+def warm_start() -> ContentSnapshot:
+    """Publish the saved snapshot at SNAPSHOT_PATH if there is one, else refresh()."""
+    if SNAPSHOT_PATH:
+        try:
+            snapshot = load_snapshot(SNAPSHOT_PATH)
+        except (OSError, ValueError, KeyError):
+            log.warning("Ignoring unreadable content snapshot at %s", SNAPSHOT_PATH)
+        else:
+            with _lock:
+                return _swap(snapshot)
+    return refresh()
+
+
+def invalidate():
+    """Drop the snapshot after a content table changes; the next read rebuilds it."""
+    with _lock:
+        _swap(None)
+
+
+def combined_body(keys, extra: dict = None) -> bytes:
+    """
+    One JSON object holding the ``keys`` resources of a single snapshot,
+    plus ``extra`` values. The pre-encoded bodies are spliced in as they
+    are, so only ``extra`` is serialized.
+    """
+    bodies = get_snapshot().bodies
+    parts = [_encode(key) + b":" + bytes(bodies[key]) for key in keys]
+    parts += [_encode(name) + b":" + _encode(value) for name, value in (extra or {}).items()]
+    return b"{" + b",".join(parts) + b"}"
+
+
+# ── HTTP ────────────────────────────────────────────────────────────────────
+
+def respond(key: str, request: Request) -> Response:
+    """
+    Serve one content resource with HTTP caching:
+      - 304 when If-None-Match (or, failing that, If-Modified-Since) matches
+      - otherwise the pre-compressed body negotiated from Accept-Encoding
+    """
+    snapshot = get_snapshot()
+    rep = snapshot.representations[key]
+    coding = rep.negotiate(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": rep.etags[coding],
+        "Cache-Control": CACHE_CONTROL,
+        "Last-Modified": snapshot.last_modified,
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = rep.matches(if_none_match)
+    else:
+        not_modified = _not_modified_since(
+            request.headers.get("if-modified-since"), snapshot.last_modified
+        )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=rep.encodings[coding], media_type="application/json", headers=headers)
+
+
+def _not_modified_since(if_modified_since, last_modified: str) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
@@ -3,84 +3,424 @@ database.py
 -----------
 SQLite database setup, table creation, and initial data seeding
 for the developer portfolio backend.
+
+Connections are borrowed from a small bounded pool instead of being opened
+per request. Every connection runs in WAL mode with tuned PRAGMAs, and is
+health-checked before it is handed out again after sitting idle.
+
+Async route handlers use a second pool of aiosqlite connections with the
+same settings; background writer threads keep using the sync pool.
 """
 
+import asyncio
 import sqlite3
 import os
 import json
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "portfolio.db")
+import aiosqlite
+
+import metrics
+
+DB_PATH = os.environ.get("PORTFOLIO_DB_PATH", os.path.join(os.path.dirname(__file__), "portfolio.db"))
+
+# ── Pool tuning ─────────────────────────────────────────────────────────────
+
+POOL_SIZE = 8                 # Max connections open at once
+POOL_TIMEOUT = 10.0           # Seconds to wait for a free connection
+HEALTH_CHECK_AFTER = 30.0     # Ping connections idle for longer than this
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, avoids fsync per commit
+    "PRAGMA cache_size = -8000",       # ~8 MB page cache per connection
+    "PRAGMA mmap_size = 67108864",     # 64 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+# Checkout wait and hold time per pool (see metrics.py)
+_SYNC_ACQUIRE = metrics.DB_ACQUIRE.labels("sync")
+_SYNC_TRANSACTION = metrics.DB_TRANSACTION.labels("sync")
+_ASYNC_ACQUIRE = metrics.DB_ACQUIRE.labels("async")
+_ASYNC_TRANSACTION = metrics.DB_TRANSACTION.labels("async")
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no pooled connection frees up within POOL_TIMEOUT."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of SQLite connections.
+
+    Idle connections remember the thread that last used them, so a worker
+    thread gets its own warm connection back whenever it is free. At most
+    ``max_size`` connections are ever open; callers block (up to ``timeout``)
+    when all of them are checked out.
+    """
+
+    def __init__(self, path, max_size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = []                 # [(conn, released_at), ...]
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _take_idle(self):
+        """Pop this thread's previous connection if idle, else the most recent one."""
+        with self._lock:
+            if not self._idle:
+                return None, 0.0
+            mine = getattr(self._local, "conn", None)
+            for i, (conn, released_at) in enumerate(self._idle):
+                if conn is mine:
+                    return self._idle.pop(i)
+            return self._idle.pop()
+
+    def acquire(self):
+        """Check out a connection. Pair every call with ``release()``."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No SQLite connection available after {self.timeout}s")
+        try:
+            conn, released_at = self._take_idle()
+            if conn is not None and time.monotonic() - released_at > HEALTH_CHECK_AFTER:
+                if not self._is_healthy(conn):
+                    conn.close()
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn):
+        """Return a connection, discarding it if it is left in a broken state."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+        else:
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commit on success, roll back on error."""
+        with _SYNC_ACQUIRE.time():
+            conn = self.acquire()
+        borrowed = time.perf_counter()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        finally:
+            self.release(conn)
+            _SYNC_TRANSACTION.observe(time.perf_counter() - borrowed)
+
+    def close(self):
+        """Close every idle connection and refuse new checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it for DB_PATH on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def close_pool():
+    """Close the process-wide pool; the next get_pool() opens a fresh one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
 
 
 def get_connection():
-    """Return a new SQLite connection with row_factory enabled."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    Borrow a pooled SQLite connection (row_factory enabled) as a context manager:
+
+        with get_connection() as conn:
+            conn.execute(...)
+
+    The transaction is committed when the block exits cleanly.
+    """
+    return get_pool().connection()
+
+
+# ── Async pool (aiosqlite) ──────────────────────────────────────────────────
+
+class AsyncConnectionPool:
+    """
+    Bounded pool of aiosqlite connections for async route handlers.
+
+    aiosqlite runs each connection's queries on a thread of its own, so a
+    handler awaiting the database holds neither the event loop nor a
+    threadpool worker. Use from one event loop only (the app's).
+    """
+
+    def __init__(self, path, max_size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._slots = asyncio.BoundedSemaphore(max_size)
+        self._idle = []                 # [(conn, released_at), ...]
+        self._closed = False
+
+    async def _connect(self):
+        conn = await aiosqlite.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+
+    @staticmethod
+    async def _is_healthy(conn):
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except (sqlite3.Error, ValueError):
+            return False
+
+    async def acquire(self):
+        """Check out a connection. Pair every call with ``release()``."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"No SQLite connection available after {self.timeout}s") from None
+        try:
+            conn, released_at = self._idle.pop() if self._idle else (None, 0.0)
+            if conn is not None and time.monotonic() - released_at > HEALTH_CHECK_AFTER:
+                if not await self._is_healthy(conn):
+                    await conn.close()
+                    conn = None
+            if conn is None:
+                conn = await self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+        return conn
+
+    async def release(self, conn):
+        """Return a connection, discarding it if it is left in a broken state."""
+        try:
+            if conn.in_transaction:
+                await conn.rollback()
+        except sqlite3.Error:
+            await conn.close()
+        else:
+            if self._closed:
+                await conn.close()
+            else:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection; commit on success, roll back on error."""
+        started = time.perf_counter()
+        conn = await self.acquire()
+        borrowed = time.perf_counter()
+        _ASYNC_ACQUIRE.observe(borrowed - started)
+        try:
+            yield conn
+            if conn.in_transaction:
+                await conn.commit()
+        finally:
+            await self.release(conn)
+            _ASYNC_TRANSACTION.observe(time.perf_counter() - borrowed)
+
+    async def close(self):
+        """Close every idle connection and refuse new checkouts."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await conn.close()
+
+
+_async_pool = None
+
+
+def get_async_pool():
+    """Return the process-wide async pool, creating it for DB_PATH on first use."""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = AsyncConnectionPool(DB_PATH)
+    return _async_pool
+
+
+async def close_async_pool():
+    """Close the async pool; the next get_async_pool() opens a fresh one."""
+    global _async_pool
+    pool, _async_pool = _async_pool, None
+    if pool is not None:
+        await pool.close()
+
+
+def async_connection():
+    """
+    Borrow a pooled aiosqlite connection as an async context manager:
+
+        async with async_connection() as conn:
+            cursor = await conn.execute(...)
+
+    The transaction is committed when the block exits cleanly.
+    """
+    return get_async_pool().connection()
 
 
 def init_db():
     """Create tables and seed initial data if the database is fresh."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # ── Tables ──────────────────────────────────────────────────────────
-    cursor.executescript("""
-        CREATE TABLE IF NOT EXISTS projects (
-            id          INTEGER PRIMARY KEY AUTOINCREMENT,
-            title       TEXT NOT NULL,
-            description TEXT NOT NULL,
-            tech_stack  TEXT NOT NULL,          -- JSON array
-            image_url   TEXT DEFAULT '',
-            github_url  TEXT DEFAULT '',
-            sort_order  INTEGER DEFAULT 0
-        );
-
-        CREATE TABLE IF NOT EXISTS experience (
-            id          INTEGER PRIMARY KEY AUTOINCREMENT,
-            role        TEXT NOT NULL,
-            company     TEXT NOT NULL,
-            period      TEXT NOT NULL,
-            description TEXT NOT NULL,          -- JSON array of bullet points
-            sort_order  INTEGER DEFAULT 0
-        );
-
-        CREATE TABLE IF NOT EXISTS skills (
-            id       INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            items    TEXT NOT NULL              -- JSON array
-        );
-
-        CREATE TABLE IF NOT EXISTS contacts (
-            id         INTEGER PRIMARY KEY AUTOINCREMENT,
-            name       TEXT NOT NULL,
-            email      TEXT NOT NULL,
-            message    TEXT NOT NULL,
-            created_at TEXT DEFAULT (datetime('now'))
-        );
-
-        CREATE TABLE IF NOT EXISTS visits (
-            id    INTEGER PRIMARY KEY CHECK (id = 1),
-            count INTEGER DEFAULT 0
-        );
-    """)
-
-    # ── Seed data (only if tables are empty) ────────────────────────────
-    if cursor.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 0:
-        _seed_projects(cursor)
-
-    if cursor.execute("SELECT COUNT(*) FROM experience").fetchone()[0] == 0:
-        _seed_experience(cursor)
-
-    if cursor.execute("SELECT COUNT(*) FROM skills").fetchone()[0] == 0:
-        _seed_skills(cursor)
-
-    if cursor.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 0:
-        cursor.execute("INSERT INTO visits (id, count) VALUES (1, 0)")
-
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        # ── Tables ──────────────────────────────────────────────────────
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS projects (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                title       TEXT NOT NULL,
+                description TEXT NOT NULL,
+                tech_stack  TEXT NOT NULL,          -- JSON array
+                image_url   TEXT DEFAULT '',
+                github_url  TEXT DEFAULT '',
+                sort_order  INTEGER DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS experience (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                role        TEXT NOT NULL,
+                company     TEXT NOT NULL,
+                period      TEXT NOT NULL,
+                description TEXT NOT NULL,          -- JSON array of bullet points
+                sort_order  INTEGER DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS skills (
+                id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                items    TEXT NOT NULL              -- JSON array
+            );
+
+            CREATE TABLE IF NOT EXISTS contacts (
+                id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                name       TEXT NOT NULL,
+                email      TEXT NOT NULL,
+                message    TEXT NOT NULL,
+                created_at TEXT DEFAULT (datetime('now'))
+            );
+
+            -- Keyset pagination for the admin inbox, newest first
+            CREATE INDEX IF NOT EXISTS idx_contacts_created
+                ON contacts (created_at DESC, id DESC);
+            CREATE INDEX IF NOT EXISTS idx_contacts_email
+                ON contacts (email, created_at DESC, id DESC);
+
+            CREATE TABLE IF NOT EXISTS visits (
+                id    INTEGER PRIMARY KEY CHECK (id = 1),
+                count INTEGER DEFAULT 0
+            );
+
+            -- Pre-aggregated visit counts: per-minute buckets rolled up
+            -- to hour and day at write time.
+            CREATE TABLE IF NOT EXISTS visit_buckets (
+                granularity  TEXT NOT NULL,         -- 'minute' | 'hour' | 'day'
+                bucket_start INTEGER NOT NULL,      -- Unix seconds, UTC
+                path         TEXT NOT NULL DEFAULT '',
+                referrer     TEXT NOT NULL DEFAULT '',  -- Referrer host
+                count        INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (granularity, bucket_start, path, referrer)
+            ) WITHOUT ROWID;
+
+            -- Chatbot knowledge base; see knowledge.py
+            CREATE TABLE IF NOT EXISTS knowledge (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                label       TEXT NOT NULL,
+                keywords    TEXT NOT NULL DEFAULT '',
+                content     TEXT NOT NULL,
+                sort_order  INTEGER DEFAULT 0,
+                updated_at  TEXT DEFAULT (datetime('now'))
+            );
+
+            -- Bumped by every knowledge write, so each worker process can
+            -- notice edits made through another one (chatbot.py polls it)
+            CREATE TABLE IF NOT EXISTS knowledge_version (
+                id      INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0
+            );
+            INSERT OR IGNORE INTO knowledge_version (id, version) VALUES (1, 0);
+
+            CREATE TRIGGER IF NOT EXISTS knowledge_version_insert AFTER INSERT ON knowledge
+            BEGIN UPDATE knowledge_version SET version = version + 1 WHERE id = 1; END;
+            CREATE TRIGGER IF NOT EXISTS knowledge_version_update AFTER UPDATE ON knowledge
+            BEGIN UPDATE knowledge_version SET version = version + 1 WHERE id = 1; END;
+            CREATE TRIGGER IF NOT EXISTS knowledge_version_delete AFTER DELETE ON knowledge
+            BEGIN UPDATE knowledge_version SET version = version + 1 WHERE id = 1; END;
+        """)
+
+        # ── Seed data (only if tables are empty) ────────────────────────
+        if cursor.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 0:
+            _seed_projects(cursor)
+
+        if cursor.execute("SELECT COUNT(*) FROM experience").fetchone()[0] == 0:
+            _seed_experience(cursor)
+
+        if cursor.execute("SELECT COUNT(*) FROM skills").fetchone()[0] == 0:
+            _seed_skills(cursor)
+
+        if cursor.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0] == 0:
+            _seed_knowledge(cursor)
+
+        if cursor.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 0:
+            cursor.execute("INSERT INTO visits (id, count) VALUES (1, 0)")
 
 
 # ── Seed helpers ────────────────────────────────────────────────────────────
@@ -195,3 +535,204 @@ def _seed_skills(cursor):
             "INSERT INTO skills (category, items) VALUES (:category, :items)",
             s,
         )
+
+
+def _seed_knowledge(cursor):
+    knowledge = [
+        # ── Professional Summary ────────────────────────────────────────
+        {
+            "label": "About Aviral",
+            "keywords": "about aviral dubey who is he summary introduction profile overview background",
+            "content": (
+                "Aviral Dubey is a Data Analyst & Applied AI Engineer based in India. "
+                "He specializes in fraud detection, machine learning, and risk analytics. "
+                "He has built real-time AI-powered fraud intelligence systems integrating "
+                "LLMs with hybrid risk scoring models.\n\n"
+                "🎓 B.Tech in Information Technology — Manipal University Jaipur\n"
+                "📊 GPA: 10.0 (Final Semester)\n"
+                "🔬 Focus: AI, Fraud Detection, Data Analytics"
+            ),
+        },
+        # ── Skills ──────────────────────────────────────────────────────
+        {
+            "label": "Technical Skills",
+            "keywords": "skills tech stack technologies programming languages frameworks tools what can he do abilities",
+            "content": (
+                "Aviral's technical skill set:\n\n"
+                "💻 Languages: Python, SQL\n"
+                "⚙️ Frameworks: FastAPI, React\n"
+                "🤖 AI & ML: Gemini AI, Scikit-learn, NLP, Risk Modeling\n"
+                "📊 Data & Analytics: Power BI, Pandas, NumPy\n"
+                "🗄️ Databases: SQLite, MySQL\n"
+                "🛠️ Tools: Git, VS Code, REST APIs\n"
+                "📐 Concepts: Risk Scoring, Fraud Detection, API Design, System Architecture"
+            ),
+        },
+        {
+            "label": "Python & AI Skills",
+            "keywords": "python programming machine learning artificial intelligence deep learning model ml ai nlp",
+            "content": (
+                "Aviral is proficient in Python for data science and AI development.\n\n"
+                "His Python expertise includes:\n"
+                "• Machine Learning with Scikit-learn\n"
+                "• Natural Language Processing (NLP)\n"
+                "• REST API development with FastAPI\n"
+                "• Data analysis with Pandas & NumPy\n"
+                "• AI integration with Gemini AI\n"
+                "• Risk modeling and statistical analysis"
+            ),
+        },
+        # ── Projects ────────────────────────────────────────────────────
+        {
+            "label": "All Projects",
+            "keywords": "projects portfolio work built what has he built developed created applications",
+            "content": (
+                "Aviral has built 3 major projects:\n\n"
+                "🚨 Fraud Shield — Real-time AI scam intelligence system\n"
+                "   Tech: Python, FastAPI, Gemini AI, SQLite\n\n"
+                "📊 Telecom Churn Prediction — ML-based customer attrition model\n"
+                "   Tech: Python, Scikit-learn, SQL\n\n"
+                "💊 Medicine Recommendation Bot — NLP-powered symptom analyzer\n"
+                "   Tech: Python, NLP"
+            ),
+        },
+        {
+            "label": "Fraud Shield Project",
+            "keywords": "fraud shield scam detection upi phishing risk engine real time intelligence system fraud detection",
+            "content": (
+                "🚨 Fraud Shield — Real-Time AI-Powered Scam Intelligence System\n\n"
+                "A comprehensive fraud detection platform targeting Indian digital scams "
+                "(UPI fraud, KYC phishing, OTP theft, fake job scams).\n\n"
+                "Key features:\n"
+                "• Hybrid multi-factor risk engine with 0–100 scoring:\n"
+                "  — Keyword Analysis (30%)\n"
+                "  — Identifier Pattern Matching (25%)\n"
+                "  — Report Frequency Escalation (20%)\n"
+                "  — Gemini AI Confidence (25%)\n"
+                "• Gemini 1.5 Flash integration for scam classification\n"
+                "• REST APIs for fraud reporting & dashboard analytics\n"
+                "• Identifier reputation tracking & repeat-offender detection\n\n"
+                "Tech Stack: Python, FastAPI, Gemini AI, SQLite"
+            ),
+        },
+        {
+            "label": "Telecom Churn Project",
+            "keywords": "telecom churn attrition customer prediction machine learning classification",
+            "content": (
+                "📊 Telecom Customer Attrition Prediction\n\n"
+                "Built ML models to predict telecom customer churn.\n\n"
+                "Highlights:\n"
+                "• Feature engineering & data preprocessing\n"
+                "• Model evaluation: accuracy, precision, recall, F1-score\n"
+                "• Delivered actionable business insights to reduce churn\n\n"
+                "Tech Stack: Python, Scikit-learn, SQL"
+            ),
+        },
+        {
+            "label": "Medicine Chatbot Project",
+            "keywords": "medicine recommendation chatbot health symptom medical drug pharmacy ai bot",
+            "content": (
+                "💊 AI-Based Medicine Recommendation Chatbot\n\n"
+                "An intelligent chatbot for symptom-based medicine suggestions.\n\n"
+                "Features:\n"
+                "• NLP pipeline for query interpretation\n"
+                "• Structured response logic for safe recommendations\n"
+                "• Handles natural language symptom descriptions\n\n"
+                "Tech Stack: Python, NLP"
+            ),
+        },
+        # ── Experience ──────────────────────────────────────────────────
+        {
+            "label": "Work Experience",
+            "keywords": "experience work internship job career professional intern company",
+            "content": (
+                "Aviral's professional experience:\n\n"
+                "📊 Data Science Intern — YBI Foundation (2024)\n"
+                "• Fraud detection use cases & exploratory data analysis\n"
+                "• Power BI dashboards for business insights\n"
+                "• Data cleaning, transformation & model validation\n\n"
+                "☁️ Salesforce Summer Intern — SmartInternz (Jul 2024)\n"
+                "• Salesforce automation, Apex, LWC & security models\n"
+                "• Completed Apex Specialist & Process Automation Superbadges"
+            ),
+        },
+        {
+            "label": "Data Science Internship",
+            "keywords": "data science intern ybi foundation power bi dashboard analytics",
+            "content": (
+                "📊 Data Science Intern — YBI Foundation (2024)\n\n"
+                "Key responsibilities:\n"
+                "• Worked on fraud detection use cases and exploratory data analysis\n"
+                "• Developed Power BI dashboards for business insights and reporting\n"
+                "• Performed data cleaning, transformation, and model validation"
+            ),
+        },
+        {
+            "label": "Salesforce Internship",
+            "keywords": "salesforce intern smartinternz apex lwc lightning crm cloud summer",
+            "content": (
+                "☁️ Salesforce Summer Intern — SmartInternz (Jul 2024)\n\n"
+                "Key achievements:\n"
+                "• Gained hands-on experience in Salesforce automation\n"
+                "• Worked with Apex, Lightning Web Components (LWC), and security models\n"
+                "• Completed Apex Specialist & Process Automation Superbadges"
+            ),
+        },
+        # ── Education ───────────────────────────────────────────────────
+        {
+            "label": "Education",
+            "keywords": "education university college degree btech bachelor study student academic gpa grade school",
+            "content": (
+                "🎓 Education\n\n"
+                "B.Tech in Information Technology\n"
+                "Manipal University Jaipur (2021–2025)\n"
+                "Final Semester GPA: 10.0\n\n"
+                "Aviral has a strong academic foundation in computer science, "
+                "data structures, algorithms, and software engineering."
+            ),
+        },
+        # ── Contact ─────────────────────────────────────────────────────
+        {
+            "label": "Contact Information",
+            "keywords": "contact email phone reach connect linkedin github social media hire hiring",
+            "content": (
+                "📬 Contact Aviral\n\n"
+                "📧 Email: er.aviraldubey@gmail.com\n"
+                "🔗 LinkedIn: linkedin.com/in/aviral-dubey-ml-engineer\n"
+                "💻 GitHub: github.com/aviral022\n"
+                "📍 Location: India"
+            ),
+        },
+        # ── Extra context sections for better matching ──────────────────
+        {
+            "label": "Fraud Detection Expertise",
+            "keywords": "fraud detection risk scoring risk analytics cybersecurity fintech financial security",
+            "content": (
+                "Aviral specializes in fraud detection and risk analytics.\n\n"
+                "His expertise includes:\n"
+                "• Building hybrid risk scoring models (0–100 scale)\n"
+                "• Integrating LLMs for scam classification\n"
+                "• Real-time identifier reputation tracking\n"
+                "• UPI fraud, KYC phishing, and OTP theft detection\n"
+                "• API-driven fraud intelligence dashboards"
+            ),
+        },
+        {
+            "label": "Data Analytics",
+            "keywords": "data analysis analytics power bi visualization reporting dashboard pandas numpy",
+            "content": (
+                "Aviral has strong data analytics skills:\n\n"
+                "• Power BI for interactive business dashboards\n"
+                "• Pandas & NumPy for data manipulation\n"
+                "• SQL for database querying and analysis\n"
+                "• Exploratory Data Analysis (EDA)\n"
+                "• Business insights and trend visualization"
+            ),
+        },
+    ]
+    for order, item in enumerate(knowledge, start=1):
+        cursor.execute(
+            "INSERT INTO knowledge (label, keywords, content, sort_order) "
+            "VALUES (:label, :keywords, :content, :sort_order)",
+            {**item, "sort_order": order},
+        )
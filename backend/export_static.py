@@ -0,0 +1,130 @@
+"""
+export_static.py
+----------------
+Export the read-only API responses as static, pre-compressed JSON files.
+
+    python export_static.py [--out ../frontend/public/snapshot]
+
+Writes the /api/projects, /api/experience and /api/skills bodies, exactly
+as the API serves them (content.py), and chatbot.json: the answers to each
+knowledge entry's label and the chat widget's topics in a few common
+phrasings, keyed by chatbot.normalize_query(). Only retrieval answers are
+exported; greetings and fallbacks pick a random reply per request, so those
+keep going to the API.
+
+Files land in a directory named after a hash of their contents, next to a
+gzip (.gz) and, when brotli is installed, a brotli (.br) copy for static
+servers that serve pre-compressed files. A version's files never change, so
+they can be cached forever; manifest.json, rewritten last, names the
+current version and is the only file a client must revalidate. The default
+output is inside frontend/public/, so `npm run build` ships the snapshot
+with the site; re-run the export after content or knowledge edits.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import chatbot
+import content
+from database import init_db
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BACKEND_DIR, "..", "frontend", "public", "snapshot")
+
+# Quick-topic chips of the chat widget (frontend/src/components/Chatbot.tsx)
+CHAT_TOPICS = ("Projects", "Skills", "Experience", "Education", "Contact")
+PHRASINGS = ("{}", "tell me about {}", "what about {}", "show me {}")
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def chatbot_answers(entries) -> dict:
+    """
+    ``{"answers": [...], "queries": {normalized query: index}}`` for every
+    phrasing that gets a retrieval answer; each distinct answer is stored once.
+    """
+    topics = [item["label"] for item in entries] + list(CHAT_TOPICS)
+    queries = {}
+    for topic in topics:
+        for phrasing in PHRASINGS:
+            query = phrasing.format(topic)
+            queries.setdefault(chatbot.normalize_query(query), query)
+
+    answers, index, keys = [], {}, {}
+    for key, answer in zip(queries, chatbot.get_answers(list(queries.values()))):
+        if answer["intent"] != "domain_query":
+            continue
+        identity = (answer["section"], answer["answer"], answer["confidence"])
+        if identity not in index:
+            index[identity] = len(answers)
+            answers.append(answer)
+        keys[key] = index[identity]
+    return {"answers": answers, "queries": keys}
+
+
+def build_files(entries) -> dict:
+    """{file name: content.Representation} for every exported resource."""
+    snapshot = content.build_snapshot()
+    files = {f"{key}.json": snapshot.representations[key] for key in content.CONTENT_KEYS}
+    body = content._encode({"engine": chatbot.CHATBOT_ENGINE, **chatbot_answers(entries)})
+    files["chatbot.json"] = content.Representation(body)
+    return files
+
+
+def export(out: str) -> dict:
+    """Write a new version under ``out`` (unless it exists) and point the manifest at it."""
+    init_db()
+    entries = chatbot.load_entries()
+    files = build_files(entries)
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode())
+        digest.update(files[name].encodings["identity"])
+    version = digest.hexdigest()[:16]
+
+    os.makedirs(out, exist_ok=True)
+    path = os.path.join(out, version)
+    if not os.path.isdir(path):
+        tmp = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(tmp)
+        for name, rep in files.items():
+            for coding, body in rep.encodings.items():
+                with open(os.path.join(tmp, name + SUFFIXES.get(coding, "")), "wb") as f:
+                    f.write(body)
+        os.rename(tmp, path)
+
+    manifest = {
+        "version": version,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": {name.removesuffix(".json"): f"{version}/{name}" for name in sorted(files)},
+    }
+    tmp = os.path.join(out, f"manifest.json.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out, "manifest.json"))
+
+    for name in os.listdir(out):
+        candidate = os.path.join(out, name)
+        if os.path.isdir(candidate) and name != version and ".tmp-" not in name:
+            shutil.rmtree(candidate, ignore_errors=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the read APIs as static JSON files.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    args = parser.parse_args()
+
+    out = os.path.abspath(args.out)
+    manifest = export(out)
+    path = os.path.join(out, manifest["version"])
+    for name in sorted(os.listdir(path)):
+        print(f"{os.path.getsize(os.path.join(path, name)):>9}  {manifest['version']}/{name}")
+    print(f"manifest.json -> {manifest['version']}")
+
+
+if __name__ == "__main__":
+    main()
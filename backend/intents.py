@@ -0,0 +1,81 @@
+"""
+intents.py
+----------
+Keyword-gated intent router for the chatbot's regex stages.
+
+Rules are tried in explicit priority order (lowest value wins), not in
+whatever order they were declared. Each rule lists the keywords that any
+match of its pattern must contain; a rule whose keywords are all absent is
+skipped without running its regex. Most queries are domain questions, so
+they usually fall through after a handful of substring checks.
+
+ASCII queries are lowercased once and matched against case-sensitive
+compilations of the patterns, which lets the regex engine use its fast
+literal search. Other queries use IGNORECASE compilations, so results are
+identical to searching every pattern with ``re.IGNORECASE``.
+"""
+
+import re
+
+_UPPERCASE_LITERAL = re.compile(r"(?<!\\)[A-Z]")
+
+
+class IntentRule:
+    """
+    One intent. ``keywords`` are lowercase substrings of which every match
+    must contain at least one (empty = always try the pattern). ``anchored``
+    rules must match the whole text, like ``re.match`` with a trailing ``$``.
+    """
+
+    __slots__ = ("name", "priority", "pattern", "keywords", "anchored")
+
+    def __init__(self, name: str, priority: int, pattern: str, keywords=(), anchored=False):
+        if _UPPERCASE_LITERAL.search(pattern):
+            raise ValueError(f"Intent pattern for {name!r} must be lowercase")
+        self.name = name
+        self.priority = priority
+        self.pattern = pattern
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.anchored = anchored
+
+
+class IntentRouter:
+    """Resolve the highest-priority matching intent for a text."""
+
+    def __init__(self, rules):
+        self.rules = sorted(rules, key=lambda rule: rule.priority)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Intent names must be unique")
+        bodies = [
+            f"^(?:{rule.pattern})$" if rule.anchored else rule.pattern for rule in self.rules
+        ]
+        self._ascii = [
+            (rule.name, rule.keywords, re.compile(body))
+            for rule, body in zip(self.rules, bodies)
+        ]
+        self._unicode = [
+            (rule.name, re.compile(body, re.IGNORECASE))
+            for rule, body in zip(self.rules, bodies)
+        ]
+
+    def route(self, text: str):
+        """Name of the winning intent, or None when no rule matches."""
+        if text.isascii():
+            lowered = text.lower()
+            for name, keywords, regex in self._ascii:
+                # Plain loop rather than any(): no generator per rule
+                for keyword in keywords:
+                    if keyword in lowered:
+                        break
+                else:
+                    if keywords:
+                        continue
+                if regex.search(lowered):
+                    return name
+            return None
+
+        for name, regex in self._unicode:
+            if regex.search(text):
+                return name
+        return None
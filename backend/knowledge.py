@@ -0,0 +1,87 @@
+"""
+knowledge.py
+------------
+The chatbot's knowledge entries, stored in the ``knowledge`` table.
+
+Each row is one retrievable answer: a label (shown as the section heading),
+keywords that only feed the TF-IDF index, and the answer content. Rows are
+ordered by (sort_order, id), which is also their order in the retrieval
+index. The admin endpoints in main.py edit rows through the async functions
+here and then hand off to chatbot.apply_knowledge_change(); the chatbot's
+loader threads read rows with the sync load_entries().
+"""
+
+from database import async_connection, get_connection
+
+KNOWLEDGE_COLUMNS = ("id", "label", "keywords", "content", "sort_order", "updated_at")
+EDITABLE_FIELDS = ("label", "keywords", "content", "sort_order")
+
+_SELECT = f"SELECT {', '.join(KNOWLEDGE_COLUMNS)} FROM knowledge"
+
+
+def load_entries() -> list:
+    """Every entry, in index order (blocking; for worker threads)."""
+    with get_connection() as conn:
+        rows = conn.execute(f"{_SELECT} ORDER BY sort_order, id").fetchall()
+    return [dict(r) for r in rows]
+
+
+def load_version() -> int:
+    """Counter bumped by every write to the table, by any process (blocking)."""
+    with get_connection() as conn:
+        return conn.execute("SELECT version FROM knowledge_version WHERE id = 1").fetchone()[0]
+
+
+async def list_entries() -> list:
+    """Every entry, in index order."""
+    async with async_connection() as conn:
+        rows = await conn.execute_fetchall(f"{_SELECT} ORDER BY sort_order, id")
+    return [dict(r) for r in rows]
+
+
+async def get_entry(entry_id: int):
+    """One entry by id, or None."""
+    async with async_connection() as conn:
+        rows = await conn.execute_fetchall(f"{_SELECT} WHERE id = ?", (entry_id,))
+    return dict(rows[0]) if rows else None
+
+
+async def create_entry(fields: dict) -> dict:
+    """Insert an entry and return it with its id."""
+    values = {name: fields[name] for name in EDITABLE_FIELDS if name in fields}
+    async with async_connection() as conn:
+        cursor = await conn.execute(
+            f"INSERT INTO knowledge ({', '.join(values)}) "
+            f"VALUES ({', '.join(':' + name for name in values)})",
+            values,
+        )
+        entry_id = cursor.lastrowid
+    return await get_entry(entry_id)
+
+
+async def update_entry(entry_id: int, fields: dict):
+    """Change the given fields of an entry; returns the updated entry, or None if missing."""
+    values = {name: fields[name] for name in EDITABLE_FIELDS if name in fields}
+    assignments = [f"{name} = :{name}" for name in values] + ["updated_at = datetime('now')"]
+    async with async_connection() as conn:
+        cursor = await conn.execute(
+            f"UPDATE knowledge SET {', '.join(assignments)} WHERE id = :id",
+            {**values, "id": entry_id},
+        )
+        if cursor.rowcount == 0:
+            return None
+    return await get_entry(entry_id)
+
+
+async def delete_entry(entry_id: int, keep: int = 0) -> bool:
+    """
+    Remove an entry unless the table would be left with fewer than ``keep``;
+    False if nothing was removed. The count is checked by the DELETE itself,
+    so concurrent deletes cannot both pass it.
+    """
+    async with async_connection() as conn:
+        cursor = await conn.execute(
+            "DELETE FROM knowledge WHERE id = ? AND (SELECT COUNT(*) FROM knowledge) > ?",
+            (entry_id, keep),
+        )
+        return cursor.rowcount > 0
@@ -3,33 +3,116 @@ main.py
 -------
 FastAPI application entry point.
 Serves the portfolio REST API with CORS enabled.
+
+Handlers are async: database routes await the aiosqlite pool and chatbot
+work runs on its own executor, each under a per-class concurrency limit
+(see concurrency.py). Each client is also rate limited per route class
+(see ratelimit.py).
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
-import json
+from typing import Annotated, Optional
+import hmac
+import os
+import time
 
-from database import init_db, get_connection
-from chatbot import get_answer
+from fastapi import Depends, FastAPI, Header, HTTPException, Path, Query, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+from database import PoolTimeout, init_db, close_pool, close_async_pool
+import concurrency
+from concurrency import Overloaded, run_chatbot
+import content
+import metrics
+import ratelimit
+from analytics import visits, parse_timestamp, query_range
+from contacts import contact_queue, list_page, export_ndjson, export_csv
+import chatbot as chatbot_engine
+import knowledge
+from chatbot import get_answer, get_answers, cache_stats
+
+MAX_BATCH_QUERIES = 5000
+MAX_QUERY_CHARS = 1000      # Longer queries are refused before they reach the chatbot
+SQLITE_MAX_INT = 2**63 - 1  # Larger integers overflow when bound to a query
 
 # ── App setup ───────────────────────────────────────────────────────────────
 
 app = FastAPI(title="Aviral Dubey – Portfolio API", version="1.0.0")
 
+# Browser origins allowed to call the API: the Vite dev and preview servers
+# by default, the deployed site's origin(s) in production
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "CORS_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173,http://localhost:4173"
+    ).split(",")
+    if origin.strip()
+]
+
+# Inside CORS, so 429 responses still carry the headers a browser needs to read them
+app.add_middleware(ratelimit.RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Content-Type"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
+# Outermost, so latency covers CORS handling and error responses too
+app.add_middleware(metrics.MetricsMiddleware)
 
 
 @app.on_event("startup")
 def startup():
-    """Initialize database and seed data on server start."""
+    """Initialize database, seed data and build the content read model."""
     init_db()
+    content.warm_start()           # Saved snapshot from serve.py, or built from the tables
+    chatbot_engine.warm_up()       # Load the TF-IDF model without delaying startup
+    visits.start()
+    contact_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Drain buffered contacts and visits, then close pooled database connections."""
+    contact_queue.stop()
+    visits.stop()
+    concurrency.shutdown()
+    await close_async_pool()
+    close_pool()
+
+
+# A request that found every pooled connection busy is as retryable as one
+# refused by its route class's limit
+@app.exception_handler(Overloaded)
+@app.exception_handler(PoolTimeout)
+async def overloaded(request: Request, exc: Exception):
+    return JSONResponse(
+        {"detail": "Server busy, please try again shortly."},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+# ── Admin access ───────────────────────────────────────────────────────────
+#
+# Admin endpoints (contact inbox, knowledge edits) require the X-Admin-Token
+# header to match the ADMIN_TOKEN environment variable. Without ADMIN_TOKEN
+# they are disabled altogether.
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: str = Header("")):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled; set ADMIN_TOKEN to enable it")
+    if not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin token")
+
+
+admin = [Depends(require_admin)]
 
 
 # ── Pydantic models ────────────────────────────────────────────────────────
@@ -40,114 +123,332 @@ class ContactForm(BaseModel):
     message: str
 
 
+ChatText = Annotated[str, Field(max_length=MAX_QUERY_CHARS)]
+SortOrder = Annotated[int, Field(ge=-SQLITE_MAX_INT - 1, le=SQLITE_MAX_INT)]
+EntryId = Annotated[int, Path(ge=1, le=SQLITE_MAX_INT)]
+
+
 class ChatQuery(BaseModel):
-    query: str
+    query: ChatText
+    compose: bool = False     # Add closely ranked matches as extra sections
+
+
+class ChatBatch(BaseModel):
+    queries: list[ChatText] = Field(..., max_length=MAX_BATCH_QUERIES)
+    compose: bool = False
+
+
+class KnowledgeEntry(BaseModel):
+    # Stripped before validation, so "   " fails min_length instead of
+    # becoming a blank label or answer
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    label: str = Field(..., min_length=1)
+    keywords: str = ""
+    content: str = Field(..., min_length=1)
+    sort_order: SortOrder = 0
+
+
+class KnowledgeUpdate(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    label: Optional[str] = Field(None, min_length=1)
+    keywords: Optional[str] = None
+    content: Optional[str] = Field(None, min_length=1)
+    sort_order: Optional[SortOrder] = None
+
+
+class VisitEvent(BaseModel):
+    path: str = ""
+    referrer: str = ""
 
 
 # ── Routes: Projects ───────────────────────────────────────────────────────
 
 @app.get("/api/projects")
-def list_projects():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM projects ORDER BY sort_order").fetchall()
-    conn.close()
-    return [
-        {
-            "id": r["id"],
-            "title": r["title"],
-            "description": r["description"],
-            "tech_stack": json.loads(r["tech_stack"]),
-            "image_url": r["image_url"],
-            "github_url": r["github_url"],
-        }
-        for r in rows
-    ]
+async def list_projects(request: Request):
+    return content.respond("projects", request)
 
 
 # ── Routes: Experience ─────────────────────────────────────────────────────
 
 @app.get("/api/experience")
-def list_experience():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM experience ORDER BY sort_order").fetchall()
-    conn.close()
-    return [
-        {
-            "id": r["id"],
-            "role": r["role"],
-            "company": r["company"],
-            "period": r["period"],
-            "description": json.loads(r["description"]),
-        }
-        for r in rows
-    ]
+async def list_experience(request: Request):
+    return content.respond("experience", request)
 
 
 # ── Routes: Skills ─────────────────────────────────────────────────────────
 
 @app.get("/api/skills")
-def list_skills():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM skills").fetchall()
-    conn.close()
-    return [
-        {
-            "id": r["id"],
-            "category": r["category"],
-            "items": json.loads(r["items"]),
-        }
-        for r in rows
-    ]
+async def list_skills(request: Request):
+    return content.respond("skills", request)
+
+
+# ── Routes: Bootstrap ──────────────────────────────────────────────────────
+
+BOOTSTRAP_FIELDS = content.CONTENT_KEYS + ("total_visits",)
+
+
+@app.post("/api/bootstrap")
+async def bootstrap(event: Optional[VisitEvent] = None, fields: Optional[str] = None):
+    """
+    Everything the page needs on load in one round trip: records the visit
+    and returns the projects, experience and skills of one content snapshot
+    with the new visit total. ``fields`` (comma separated, default all of
+    BOOTSTRAP_FIELDS) trims the response, e.g. to ``total_visits`` when the
+    content comes from the static export.
+    """
+    selected = BOOTSTRAP_FIELDS
+    if fields is not None:
+        # Repeated names are kept once, in order, so no key appears twice
+        selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        if not selected:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No fields selected; choose from {', '.join(BOOTSTRAP_FIELDS)}",
+            )
+        unknown = [name for name in selected if name not in BOOTSTRAP_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields {', '.join(unknown)}; choose from {', '.join(BOOTSTRAP_FIELDS)}",
+            )
+
+    event = event or VisitEvent()
+    total = visits.increment(path=event.path, referrer=event.referrer)
+    keys = [name for name in selected if name in content.CONTENT_KEYS]
+    extra = {"total_visits": total} if "total_visits" in selected else None
+    return Response(
+        content=content.combined_body(keys, extra),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
 
 # ── Routes: Contact ────────────────────────────────────────────────────────
 
 @app.post("/api/contact")
-def submit_contact(form: ContactForm):
-    conn = get_connection()
-    conn.execute(
-        "INSERT INTO contacts (name, email, message) VALUES (?, ?, ?)",
-        (form.name, form.email, form.message),
-    )
-    conn.commit()
-    conn.close()
+async def submit_contact(form: ContactForm):
+    if not contact_queue.submit(form.name, form.email, form.message):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many messages right now, please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
     return {"status": "success", "message": "Thank you for reaching out!"}
 
 
-@app.get("/api/contacts")
-def list_contacts():
-    """Admin endpoint — list all submitted messages."""
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM contacts ORDER BY created_at DESC").fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+@app.get("/api/contacts/metrics", dependencies=admin)
+async def contact_metrics():
+    """Admin endpoint — contact queue depth, throughput and flush latency."""
+    return contact_queue.metrics()
+
+
+@app.get("/api/contacts", dependencies=admin)
+async def list_contacts(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    email: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
+):
+    """
+    Admin endpoint — submitted messages, newest first.
+
+    ``format=json`` returns one page of ``limit`` rows; pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` for the next page.
+    ``format=ndjson`` / ``csv`` stream every matching row instead.
+    """
+    try:
+        if format == "ndjson":
+            chunks = await concurrency.stream("export", export_ndjson(email, since, until))
+            return StreamingResponse(chunks, media_type="application/x-ndjson")
+        if format == "csv":
+            chunks = await concurrency.stream("export", export_csv(email, since, until))
+            return StreamingResponse(
+                chunks,
+                media_type="text/csv",
+                headers={"Content-Disposition": 'attachment; filename="contacts.csv"'},
+            )
+        async with concurrency.limit("db"):
+            rows, next_cursor = await list_page(limit, cursor, email, since, until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return JSONResponse(rows, headers=headers)
 
 
 # ── Routes: Chatbot ────────────────────────────────────────────────────────
 
 @app.post("/api/chatbot")
-def chatbot(query: ChatQuery):
-    return get_answer(query.query)
+async def chatbot(query: ChatQuery):
+    async with concurrency.limit("chatbot"):
+        return await run_chatbot(get_answer, query.query, query.compose)
+
+
+@app.post("/api/chatbot/stream")
+async def chatbot_stream(query: ChatQuery):
+    """Stream the answer as NDJSON: heading and intent first, then the text."""
+    # Scoring happens before the first event, on the chatbot executor; the
+    # rest is composing and chunking text, which never blocks, so it runs on
+    # the event loop instead of hopping to a worker thread once per chunk
+    events = chatbot_engine.stream_events(query.query, query.compose)
+    async with concurrency.limit("chatbot"):
+        first = await run_chatbot(next, events)
+
+    async def lines():
+        yield chatbot_engine.encode_event(first)
+        for event in events:
+            yield chatbot_engine.encode_event(event)
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/chatbot/batch")
+async def chatbot_batch(batch: ChatBatch):
+    """Answer up to MAX_BATCH_QUERIES queries in one vectorized pass."""
+    async with concurrency.limit("chatbot"):
+        return await run_chatbot(get_answers, batch.queries, batch.compose)
+
+
+@app.get("/api/chatbot/cache")
+async def chatbot_cache():
+    """Answer cache size, hit rate, and eviction counters."""
+    return cache_stats()
+
+
+# ── Routes: Knowledge base (admin) ─────────────────────────────────────────
+#
+# Every write is applied to the chatbot right away (changed rows only) and
+# followed by a background refit; see chatbot.apply_knowledge_change().
+
+@app.get("/api/knowledge", dependencies=admin)
+async def list_knowledge():
+    """Admin endpoint — chatbot knowledge entries in index order."""
+    async with concurrency.limit("db"):
+        return await knowledge.list_entries()
+
+
+@app.get("/api/knowledge/{entry_id}", dependencies=admin)
+async def get_knowledge(entry_id: EntryId):
+    async with concurrency.limit("db"):
+        entry = await knowledge.get_entry(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Knowledge entry not found")
+    return entry
+
+
+@app.post("/api/knowledge", status_code=201, dependencies=admin)
+async def create_knowledge(entry: KnowledgeEntry):
+    async with concurrency.limit("db"):
+        created = await knowledge.create_entry(entry.model_dump())
+    await run_chatbot(chatbot_engine.apply_knowledge_change)
+    return created
+
+
+@app.patch("/api/knowledge/{entry_id}", dependencies=admin)
+async def update_knowledge(entry_id: EntryId, changes: KnowledgeUpdate):
+    fields = changes.model_dump(exclude_none=True)
+    async with concurrency.limit("db"):
+        if fields:
+            updated = await knowledge.update_entry(entry_id, fields)
+        else:
+            updated = await knowledge.get_entry(entry_id)   # Nothing to change
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Knowledge entry not found")
+    if fields:
+        await run_chatbot(chatbot_engine.apply_knowledge_change)
+    return updated
+
+
+@app.delete("/api/knowledge/{entry_id}", dependencies=admin)
+async def delete_knowledge(entry_id: EntryId):
+    async with concurrency.limit("db"):
+        deleted = await knowledge.delete_entry(entry_id, keep=chatbot_engine.MIN_ENTRIES)
+        missing = not deleted and await knowledge.get_entry(entry_id) is None
+    if missing:
+        raise HTTPException(status_code=404, detail="Knowledge entry not found")
+    if not deleted:
+        raise HTTPException(
+            status_code=409,
+            detail=f"The chatbot needs at least {chatbot_engine.MIN_ENTRIES} entries",
+        )
+    await run_chatbot(chatbot_engine.apply_knowledge_change)
+    return {"status": "deleted"}
 
 
 # ── Routes: Analytics ──────────────────────────────────────────────────────
 
 @app.get("/api/analytics")
-def get_analytics():
-    conn = get_connection()
-    row = conn.execute("SELECT count FROM visits WHERE id = 1").fetchone()
-    conn.close()
-    return {"total_visits": row["count"] if row else 0}
+async def get_analytics(
+    from_: Optional[str] = Query(None, alias="from"),
+    to: Optional[str] = None,
+    granularity: str = "hour",
+):
+    """
+    Lifetime visit total. With ``from`` and/or ``to`` (ISO 8601 or Unix
+    seconds) also returns a visit series read from the precomputed
+    minute / hour / day rollups; the range defaults to the last 24 hours.
+    """
+    result = {"total_visits": visits.total()}
+    if from_ is None and to is None:
+        return result
+    try:
+        end = parse_timestamp(to) if to else int(time.time())
+        start = parse_timestamp(from_) if from_ else end - 86400
+        async with concurrency.limit("db"):
+            result.update(await query_range(start, end, granularity))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return result
 
 
 @app.post("/api/analytics/visit")
-def record_visit():
-    conn = get_connection()
-    conn.execute("UPDATE visits SET count = count + 1 WHERE id = 1")
-    conn.commit()
-    row = conn.execute("SELECT count FROM visits WHERE id = 1").fetchone()
-    conn.close()
-    return {"total_visits": row["count"]}
+async def record_visit(event: Optional[VisitEvent] = None):
+    if event is None:
+        return {"total_visits": visits.increment()}
+    return {"total_visits": visits.increment(path=event.path, referrer=event.referrer)}
+
+
+# ── Routes: Metrics ────────────────────────────────────────────────────────
+
+@metrics.register_collector
+def _cache_and_queue_metrics():
+    cache = cache_stats()
+    queue = contact_queue.metrics()
+    return [
+        ("chatbot_cache_lookups_total", "Answer cache lookups.", "counter", [
+            ({"result": "hit"}, cache["hits"]),
+            ({"result": "miss"}, cache["misses"]),
+        ]),
+        ("chatbot_cache_entries", "Answers currently cached.", "gauge", [({}, cache["size"])]),
+        ("contact_queue_depth", "Contact messages waiting to be written.", "gauge", [
+            ({}, queue["queue_depth"]),
+        ]),
+        ("contact_messages_total", "Contact messages by outcome.", "counter", [
+            ({"outcome": "accepted"}, queue["accepted"]),
+            ({"outcome": "rejected"}, queue["rejected"]),
+            ({"outcome": "written"}, queue["written"]),
+        ]),
+        ("rate_limit_clients", "Clients with a rate limit bucket, by route class.", "gauge", [
+            ({"route_class": name}, count) for name, count in ratelimit.clients().items()
+        ]),
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint: per-route latency histograms with p50 / p95 /
+    p99 estimates, database and chatbot stage timings, and the chatbot's
+    intent and confidence distributions. Counts are per worker process.
+    """
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
 # ── Run ─────────────────────────────────────────────────────────────────────
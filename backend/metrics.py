@@ -0,0 +1,298 @@
+"""
+metrics.py
+----------
+In-process request metrics, exposed in the Prometheus text format.
+
+Latencies are recorded into fixed-bucket histograms: an observation is one
+bisect over the bucket bounds plus three additions under a lock, so the
+instrumentation stays on in production. p50 / p95 / p99 are estimated from
+the buckets when the metrics are rendered (linear interpolation inside the
+bucket, like Prometheus' histogram_quantile), never on the request path.
+
+Metric families are declared once, here, with fixed label names; callers
+pick a labelled child with ``labels()`` and keep a reference to it where
+they can. Every worker process keeps its own counts.
+"""
+
+import bisect
+import threading
+import time
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+STAGE_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0,
+)
+CONFIDENCE_BUCKETS = (0.05, 0.08, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ── Metric types ────────────────────────────────────────────────────────────
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observations (seconds, scores, ...)."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)     # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Context manager observing the seconds spent inside the block."""
+        return Span(self)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile from the buckets; NaN before any observation."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return float("nan")
+        rank, seen = q * total, 0
+        for i, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if i == len(self.bounds):            # +Inf bucket: best bound we have
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+class Span:
+    """``with histogram.time():`` — observes the elapsed seconds on exit."""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Family:
+    """A named metric with one child per combination of label values."""
+
+    def __init__(self, name, help_text, kind, labelnames=(), buckets=None):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = Histogram(self.buckets) if self.kind == "histogram" else Counter()
+                    self._children[values] = child
+        return child
+
+    def children(self):
+        with self._lock:
+            return sorted(self._children.items())
+
+
+_families = []
+
+
+def counter(name, help_text, labelnames=()) -> Family:
+    family = Family(name, help_text, "counter", labelnames)
+    _families.append(family)
+    return family
+
+
+def histogram(name, help_text, labelnames=(), buckets=LATENCY_BUCKETS) -> Family:
+    family = Family(name, help_text, "histogram", labelnames, buckets)
+    _families.append(family)
+    return family
+
+
+# ── Instrumented stages ─────────────────────────────────────────────────────
+
+HTTP_LATENCY = histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk.",
+    ("method", "route"),
+)
+HTTP_REQUESTS = counter(
+    "http_requests_total", "Responses sent, by route and status code.",
+    ("method", "route", "status"),
+)
+DB_ACQUIRE = histogram(
+    "db_pool_acquire_seconds", "Wait for a pooled SQLite connection (connect included).",
+    ("pool",), STAGE_BUCKETS,
+)
+DB_TRANSACTION = histogram(
+    "db_transaction_seconds", "Time a borrowed connection is held (queries and commit).",
+    ("pool",), STAGE_BUCKETS,
+)
+CONTENT_BUILD = histogram(
+    "content_build_seconds", "Building the content read model, by stage.",
+    ("stage",), STAGE_BUCKETS,
+)
+CHATBOT_STAGE = histogram(
+    "chatbot_stage_seconds", "Chatbot pipeline stages, per get_answers() call.",
+    ("stage",), STAGE_BUCKETS,
+)
+CHATBOT_ANSWERS = counter(
+    "chatbot_answers_total", "Chatbot answers by intent (cache hits included).", ("intent",),
+)
+CHATBOT_CONFIDENCE = histogram(
+    "chatbot_confidence", "Best-match score of answers from the retrieval stage.",
+    ("intent",), CONFIDENCE_BUCKETS,
+)
+
+_collectors = []
+
+
+def register_collector(fn):
+    """
+    Add values read at scrape time, e.g. counters another module already
+    keeps. ``fn()`` returns [(name, help, kind, [(labels dict, value), ...]), ...].
+    """
+    _collectors.append(fn)
+    return fn
+
+
+# ── Exposition ──────────────────────────────────────────────────────────────
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _number(value) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _render_family(family: Family, lines: list):
+    lines.append(f"# HELP {family.name} {family.help}")
+    lines.append(f"# TYPE {family.name} {family.kind}")
+    quantiles = []
+    for values, child in family.children():
+        pairs = list(zip(family.labelnames, values))
+        if family.kind == "counter":
+            lines.append(f"{family.name}{_labels(pairs)} {child.value}")
+            continue
+        with child._lock:
+            counts, total, sum_ = list(child.counts), child.count, child.sum
+        cumulative = 0
+        for bound, count in zip(family.buckets + ("+Inf",), counts):
+            cumulative += count
+            lines.append(f"{family.name}_bucket{_labels(pairs + [('le', bound)])} {cumulative}")
+        lines.append(f"{family.name}_sum{_labels(pairs)} {_number(sum_)}")
+        lines.append(f"{family.name}_count{_labels(pairs)} {total}")
+        for q in QUANTILES:
+            quantiles.append(f"{family.name}_quantile{_labels(pairs + [('quantile', q)])} "
+                             f"{_number(child.quantile(q))}")
+    if quantiles:
+        lines.append(f"# HELP {family.name}_quantile Estimated from the {family.name} buckets.")
+        lines.append(f"# TYPE {family.name}_quantile gauge")
+        lines.extend(quantiles)
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for family in _families:
+        _render_family(family, lines)
+    for collect in _collectors:
+        for name, help_text, kind, samples in collect():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(list(labels.items()))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ── ASGI middleware ─────────────────────────────────────────────────────────
+
+# Any token is a valid method; others are grouped so clients cannot add labels
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording every HTTP request's latency and status.
+
+    Requests are labelled with the route's path template
+    ("/api/knowledge/{entry_id}"), set by the router on the shared scope, so
+    label cardinality stays bounded; unmatched paths and non-standard methods
+    are grouped as "other".
+    Latency runs until the last body chunk is sent, so streamed responses
+    count in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "other"
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "other"
+            HTTP_LATENCY.labels(method, path).observe(elapsed)
+            HTTP_REQUESTS.labels(method, path, str(status)).inc()
@@ -0,0 +1,150 @@
+"""
+ratelimit.py
+------------
+Per-client, per-route-class rate limiting for the API.
+
+Every request is charged to a token bucket keyed by its route class (see
+ROUTE_CLASSES) and client address. Cheap reads get a generous budget,
+chatbot scoring and writes a much smaller one, so a client hammering
+/api/chatbot or /api/contact is refused with 429 and a Retry-After header
+long before it slows everyone else down.
+
+A bucket is stored as a single float, the time at which it will be full
+again (the GCRA form of a token bucket): a request is admitted while that
+time is less than one burst ahead of now, and pushes it one refill interval
+further. Clients idle long enough for their bucket to refill are the same
+as clients never seen, so each class's table is a bounded LRU that simply
+forgets its least recently seen clients once MAX_CLIENTS is reached.
+
+The middleware runs on the event loop, so the tables need no lock; limits
+are per worker process. Budgets can be overridden with environment
+variables, and RATE_LIMIT_ENABLED=0 turns limiting off (benchmarks).
+"""
+
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+
+import metrics
+
+
+def _env_budget(name: str, default: str) -> tuple:
+    """``"rate,burst"`` (requests per second, bucket size) from ``name``."""
+    rate, burst = os.environ.get(name, default).split(",")
+    return float(rate), int(burst)
+
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+MAX_CLIENTS = int(os.environ.get("RATE_LIMIT_MAX_CLIENTS", 10_000))   # Per route class
+
+BUDGETS = {
+    "read": _env_budget("RATE_LIMIT_READ", "20,120"),       # Served from memory
+    "chatbot": _env_budget("RATE_LIMIT_CHATBOT", "1,20"),   # CPU-bound scoring
+    "write": _env_budget("RATE_LIMIT_WRITE", "2,30"),       # Visits, knowledge edits
+    "contact": _env_budget("RATE_LIMIT_CONTACT", "0.02,5"), # About one a minute
+}
+
+# (method, path) -> route class; paths ending in an id ("/api/knowledge/3")
+# are looked up without it. Unlisted GETs are reads, anything else a write.
+ROUTE_CLASSES = {
+    ("POST", "/api/chatbot"): "chatbot",
+    ("POST", "/api/chatbot/stream"): "chatbot",
+    ("POST", "/api/chatbot/batch"): "chatbot",
+    ("POST", "/api/contact"): "contact",
+}
+EXEMPT = {"/metrics"}       # Scraped by monitoring, not by visitors
+
+_REJECTED = metrics.counter(
+    "rate_limited_total", "Requests refused with 429, by route class.", ("route_class",),
+)
+_BODY = json.dumps({"detail": "Too many requests, please slow down."}).encode()
+
+
+def route_class(method: str, path: str) -> str:
+    found = ROUTE_CLASSES.get((method, path))
+    if found is None:
+        head, _, tail = path.rpartition("/")
+        found = ROUTE_CLASSES.get((method, head)) if tail.isdigit() else None
+        if found is None:
+            found = "read" if method in ("GET", "HEAD") else "write"
+    return found
+
+
+class TokenBuckets:
+    """
+    One route class's buckets: ``rate`` requests per second per client,
+    bursts of up to ``burst``, at most ``max_clients`` clients remembered.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = MAX_CLIENTS):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * burst     # How far ahead a full time may run
+        self.max_clients = max_clients
+        self._full_at = OrderedDict()              # client -> time its bucket is full
+
+    def acquire(self, client, now: float) -> float:
+        """Take a token for ``client``: 0 if admitted, else seconds until one is free."""
+        table = self._full_at
+        full_at = table.get(client, now)
+        if full_at < now:
+            full_at = now
+        full_at += self.interval
+        wait = full_at - now - self.tolerance
+        if wait > 0:
+            return wait
+        table[client] = full_at
+        table.move_to_end(client)
+        if len(table) > self.max_clients:
+            table.popitem(last=False)
+        return 0.0
+
+    def __len__(self):
+        return len(self._full_at)
+
+
+buckets = {name: TokenBuckets(rate, burst) for name, (rate, burst) in BUDGETS.items()}
+
+
+def clients() -> dict:
+    """Clients currently remembered per route class."""
+    return {name: len(table) for name, table in buckets.items()}
+
+
+# ── ASGI middleware ─────────────────────────────────────────────────────────
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware answering 429 once a client's bucket for the
+    request's route class is empty. Clients are identified by the address
+    the server reports (behind a proxy, run uvicorn with --proxy-headers).
+    """
+
+    def __init__(self, app, enabled: bool = RATE_LIMIT_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"] in EXEMPT:
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope["method"], scope["path"])
+        client = scope.get("client")
+        wait = buckets[name].acquire(client[0] if client else None, time.monotonic())
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        _REJECTED.labels(name).inc()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_BODY)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _BODY})
@@ -0,0 +1,75 @@
+"""
+retrieval.py
+------------
+Precomputed similarity index for the chatbot's knowledge base.
+
+Document vectors are L2-normalized once when the index is built, so cosine
+similarity at query time is a single sparse dot product. Only the top-k
+candidates are selected (argpartition) and sorted, so per-query cost stays
+flat as the knowledge base grows into the thousands of entries.
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+def l2_normalize(matrix) -> sparse.csr_matrix:
+    """Return a CSR copy of ``matrix`` with unit-length rows (zero rows stay zero)."""
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64, copy=True)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0.0] = 1.0
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+    return matrix
+
+
+class RetrievalIndex:
+    """
+    Cosine-similarity index over a fixed set of document vectors.
+
+    Build it once from the fitted TF-IDF matrix; ``search()`` then scores a
+    batch of query vectors against every document with one sparse matmul and
+    returns the best ``k`` matches per query, best first.
+    """
+
+    def __init__(self, doc_matrix):
+        # Stored transposed so scoring is (queries x terms) @ (terms x docs)
+        self.matrix_t = l2_normalize(doc_matrix).T.tocsr()
+
+    @classmethod
+    def from_transposed(cls, matrix_t):
+        """Wrap an already normalized, transposed (terms x docs) CSR matrix as-is."""
+        index = cls.__new__(cls)
+        index.matrix_t = matrix_t
+        return index
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        """Normalized (docs x terms) matrix."""
+        return self.matrix_t.T.tocsr()
+
+    @property
+    def size(self) -> int:
+        return self.matrix_t.shape[1]
+
+    def scores(self, query_matrix) -> np.ndarray:
+        """Dense (n_queries x n_docs) cosine similarities."""
+        queries = l2_normalize(query_matrix)
+        return np.asarray((queries @ self.matrix_t).todense())
+
+    def search(self, query_matrix, k: int = 1):
+        """
+        Top-``k`` documents per query as ``(indices, scores)``, each shaped
+        (n_queries x k) and ordered best first; equal scores are ordered by
+        document index.
+        """
+        scores = self.scores(query_matrix)
+        k = max(1, min(k, self.size))
+        if k < self.size:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(self.size), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        # Sort each row's candidates by score desc, then doc index asc
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        indices = np.take_along_axis(candidates, order, axis=1)
+        return indices, np.take_along_axis(candidate_scores, order, axis=1)
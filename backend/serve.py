@@ -0,0 +1,89 @@
+"""
+serve.py
+--------
+Production launcher for the API.
+
+    python serve.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+
+Before any worker starts, a one-off build step creates and seeds the
+database, fits and persists the chatbot model under chatbot.MODEL_DIR and
+saves the content snapshot under SNAPSHOT_DIR. The build runs in a child
+process, so the long-lived supervisor never imports scikit-learn. Workers
+then open both artifacts read-only: the model arrays and the encoded
+content bodies are memory-mapped files whose pages every worker shares
+through the OS page cache, instead of each process refitting, compressing
+and holding its own copy.
+
+Workers share only the database. A knowledge edit reaches the other
+workers when they next poll its version (chatbot.KNOWLEDGE_POLL_INTERVAL),
+and visit totals when they next flush (analytics.FLUSH_INTERVAL).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.environ.get("CONTENT_SNAPSHOT_DIR", os.path.join(BACKEND_DIR, ".snapshot"))
+
+
+def prebuild() -> dict:
+    """Build the artifacts shared by all workers and return where they are."""
+    import chatbot
+    import content
+    from database import init_db
+
+    init_db()
+    model = chatbot.load_model()
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = content.save_snapshot(content.build_snapshot(), SNAPSHOT_DIR)
+    for name in os.listdir(SNAPSHOT_DIR):
+        candidate = os.path.join(SNAPSHOT_DIR, name)
+        if name.startswith("content-") and candidate != path and ".tmp-" not in name:
+            shutil.rmtree(candidate, ignore_errors=True)
+    return {"content_snapshot": path, "model_fingerprint": model.fingerprint}
+
+
+def _prebuild_in_child() -> dict:
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--prebuild-only"],
+        cwd=BACKEND_DIR, stdout=subprocess.PIPE, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the portfolio API with prebuilt, shared data.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--prebuild-only", action="store_true",
+                        help="build the shared artifacts, print their paths as JSON and exit")
+    args = parser.parse_args()
+
+    if args.prebuild_only:
+        print(json.dumps(prebuild()))
+        return
+
+    artifacts = _prebuild_in_child()
+    # Inherited by every worker; content.py reads it at import
+    os.environ["CONTENT_SNAPSHOT_PATH"] = artifacts["content_snapshot"]
+
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        app_dir=BACKEND_DIR,
+    )
+
+
+if __name__ == "__main__":
+    main()
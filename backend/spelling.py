@@ -0,0 +1,122 @@
+"""
+spelling.py
+-----------
+Typo correction for chatbot queries against a fixed vocabulary, SymSpell
+style.
+
+Every vocabulary word is indexed once under each string obtained by
+deleting up to MAX_EDIT_DISTANCE of its characters. A misspelled word is
+corrected by generating its own deletes and looking each one up in that
+index: candidates come from a handful of hash lookups instead of an
+edit-distance scan over the vocabulary, and only those few candidates are
+checked with a real (Damerau-Levenshtein) distance. Words already in the
+vocabulary cost one set lookup.
+"""
+
+from vectorizer import TOKEN_PATTERN
+
+MAX_EDIT_DISTANCE = 2
+# Short words collide with other real words too easily ("bake" -> "fake"),
+# so they are left alone or allowed a single edit
+MIN_WORD_LENGTH = 5
+SHORT_WORD_LENGTH = 7
+
+# Everyday words one edit away from a portfolio term ("stock" -> "stack",
+# "trade" -> "grade"); they are what the user meant, so they are never
+# corrected, and an off-topic query stays off topic
+COMMON_WORDS = frozenset({
+    "bases", "beach", "build", "cares", "grace", "lower", "modal", "pools",
+    "resign", "resort", "scare", "scope", "shore", "slack", "snack", "spill",
+    "stale", "stark", "stick", "stock", "store", "stuck", "teach", "tower",
+    "trade", "wealth",
+})
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """``word`` and every string made by deleting up to ``max_distance`` characters."""
+    found, frontier = {word}, {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellingCorrector:
+    """
+    Deletion index over ``words`` ({word: frequency}). ``correct()`` rewrites
+    the unknown words of a query to their closest vocabulary word, closest
+    first, then most frequent, then alphabetical. Words in ``ignore`` or
+    COMMON_WORDS are left alone.
+    """
+
+    def __init__(self, words: dict, max_distance: int = MAX_EDIT_DISTANCE, ignore=frozenset()):
+        self.words = dict(words)
+        self.max_distance = max_distance
+        self.ignore = frozenset(ignore) | COMMON_WORDS   # Known non-vocabulary words, e.g. stop words
+        # No word longer than this is within max_distance of the vocabulary
+        self.max_length = max(map(len, self.words), default=0) + max_distance
+        self._deletes = {}
+        for word in self.words:
+            for variant in _deletes(word, max_distance):
+                self._deletes.setdefault(variant, []).append(word)
+
+    def suggest(self, word: str):
+        """Closest vocabulary word to ``word``, or None if none is close enough."""
+        if word in self.words:
+            return word
+        if len(word) > self.max_length:
+            return None         # Also bounds the deletes generated below
+        limit = 1 if len(word) <= SHORT_WORD_LENGTH else self.max_distance
+        best, best_key, seen = None, None, set()
+        level = {word}
+        for deleted in range(limit + 1):
+            # A candidate within distance d is reached by deleting at most d
+            # characters of the word, so those not found yet are at least
+            # ``deleted`` away and cannot beat a closer one
+            if best_key is not None and best_key[0] < deleted:
+                break
+            if deleted:
+                level = {w[:i] + w[i + 1:] for w in level if len(w) > 1 for i in range(len(w))}
+            for variant in level:
+                for candidate in self._deletes.get(variant, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    if candidate.startswith(word) or word.startswith(candidate):
+                        continue        # Another form of the word ("project"), not a typo
+                    distance = edit_distance(word, candidate, limit)
+                    if distance <= limit:
+                        key = (distance, -self.words[candidate], candidate)
+                        if best_key is None or key < best_key:
+                            best, best_key = candidate, key
+        return best
+
+    def correct(self, text: str) -> str:
+        """``text`` lowercased, with every unknown word replaced by its suggestion."""
+        words, ignore = self.words, self.ignore
+
+        def replace(match):
+            word = match.group()
+            if word in words or word in ignore or len(word) < MIN_WORD_LENGTH or not word.isalpha():
+                return word
+            return self.suggest(word) or word
+
+        return TOKEN_PATTERN.sub(replace, text.lower())
@@ -0,0 +1,76 @@
+"""
+vectorizer.py
+-------------
+Lightweight TF-IDF query vectorizer for the chatbot's serving path.
+
+Reproduces scikit-learn's ``TfidfVectorizer.transform`` for the settings the
+chatbot uses (lowercase, default token pattern, stop-word list, word
+n-grams, l2 norm) from the saved vocabulary and idf weights alone, so
+worker processes never import scikit-learn. Every arithmetic step follows
+scikit-learn's order of operations, which keeps the resulting vectors — and
+therefore similarity scores — bit-for-bit identical.
+"""
+
+import math
+import re
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def analyze(text: str, stop_words=frozenset(), ngram_range=(1, 1)) -> list:
+    """Lowercase, tokenize, drop stop words, then emit word n-grams."""
+    tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in stop_words]
+    min_n, max_n = ngram_range
+    features = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+        for i in range(len(tokens) - n + 1):
+            features.append(" ".join(tokens[i:i + n]))
+    return features
+
+
+class QueryVectorizer:
+    """TF-IDF transform over a fixed vocabulary, built with NumPy/SciPy only."""
+
+    def __init__(self, vocabulary: dict, idf, stop_words, ngram_range=(1, 1)):
+        self.vocabulary_ = vocabulary
+        self.idf_ = np.asarray(idf, dtype=np.float64)
+        self.stop_words = frozenset(stop_words)
+        self.ngram_range = tuple(ngram_range)
+
+    def analyze(self, text: str) -> list:
+        return analyze(text, self.stop_words, self.ngram_range)
+
+    def transform(self, texts) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows, one per text, as float64 CSR."""
+        vocabulary = self.vocabulary_
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            row = {}
+            for feature in self.analyze(text):
+                j = vocabulary.get(feature)
+                if j is not None:
+                    row[j] = row.get(j, 0) + 1
+            for j in sorted(row):
+                indices.append(j)
+                counts.append(row[j])
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float64) * self.idf_[indices]
+        # Row norms accumulated left to right, as scikit-learn does; np.sum's
+        # pairwise summation would round differently on longer rows.
+        squares = (data * data).tolist()
+        for start, end in zip(indptr, indptr[1:]):
+            total = 0.0
+            for value in squares[start:end]:
+                total += value
+            if total != 0.0:
+                data[start:end] /= math.sqrt(total)
+
+        return sparse.csr_matrix(
+            (data, indices, np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(self.idf_)),
+        )
@@ -1,15 +1,139 @@
 import axios from 'axios';
 
 const API_BASE = '/api';
+/* Static export of the read APIs (backend/export_static.py); set to '' to always use the API */
+const SNAPSHOT_BASE: string = import.meta.env.VITE_SNAPSHOT_BASE ?? '/snapshot';
+
+/* One line of the /chatbot/stream NDJSON response */
+export interface ChatEvent {
+    event: 'meta' | 'section' | 'chunk' | 'done';
+    section?: string;
+    intent?: string;
+    confidence?: number;
+    text?: string;
+}
+
+/* A /chatbot response */
+export interface ChatAnswer {
+    section: string;
+    answer: string;
+    confidence: number;
+    intent: string;
+}
+
+/* ── Static snapshot ───────────────────────────────────────────────────── */
+interface SnapshotManifest {
+    version: string;
+    files: Record<string, string>;
+}
+
+interface ChatSnapshot {
+    answers: ChatAnswer[];
+    queries: Record<string, number>;
+}
+
+let manifest: Promise<SnapshotManifest | null> | null = null;
+const snapshotFiles = new Map<string, Promise<unknown>>();
+
+const snapshotManifest = (): Promise<SnapshotManifest | null> => {
+    if (!SNAPSHOT_BASE) return Promise.resolve(null);
+    return (manifest ??= fetch(`${SNAPSHOT_BASE}/manifest.json`, { cache: 'no-cache' })
+        .then(r => (r.ok ? r.json() : null))
+        .catch(() => null));
+};
+
+/* A resource from the current snapshot, or null when there is none (then ask the API) */
+function fromSnapshot<T>(key: string): Promise<T | null> {
+    let file = snapshotFiles.get(key);
+    if (!file) {
+        file = snapshotManifest()
+            .then(m => (m?.files[key] ? fetch(`${SNAPSHOT_BASE}/${m.files[key]}`) : null))
+            .then(r => (r?.ok ? r.json() : null))
+            .catch(() => null);
+        snapshotFiles.set(key, file);
+    }
+    return file as Promise<T | null>;
+}
+
+/* ── Page-load bootstrap ───────────────────────────────────────────────── */
+const CONTENT_KEYS = ['projects', 'experience', 'skills'];
+let boot: Promise<Record<string, any>> | null = null;
+
+/* The page's one API request on load: records the visit and returns the content the snapshot lacks */
+const bootstrap = () =>
+    (boot ??= snapshotManifest().then(m => {
+        const fields = [...CONTENT_KEYS.filter(key => !m?.files[key]), 'total_visits'];
+        return axios
+            .post(
+                `${API_BASE}/bootstrap`,
+                { path: window.location.pathname, referrer: document.referrer },
+                { params: { fields: fields.join(',') } },
+            )
+            .then(r => r.data);
+    }));
+
+/* Snapshot first, then the bootstrap response, then the resource's own endpoint */
+const read = (key: string) =>
+    fromSnapshot(key)
+        .then(data => data ?? bootstrap().then(b => b[key], () => undefined))
+        .then(data => data ?? axios.get(`${API_BASE}/${key}`).then(r => r.data));
+
+/* Same key as chatbot.normalize_query() in the backend */
+export const normalizeQuery = (query: string) =>
+    query
+        .toLowerCase()
+        .replace(/\s+/g, ' ')
+        .replace(/([^\p{L}\p{N}_\s'])\1+/gu, '$1')
+        .trimStart()
+        .replace(/[ !?.]+$/, '');
+
+/* Exported answer to a common question, or null when the API has to answer it */
+const snapshotAnswer = async (query: string): Promise<ChatAnswer | null> => {
+    const chat = await fromSnapshot<ChatSnapshot>('chatbot');
+    const n = chat?.queries[normalizeQuery(query)];
+    return chat && n !== undefined ? chat.answers[n] : null;
+};
 
 export const api = {
-    getProjects: () => axios.get(`${API_BASE}/projects`).then(r => r.data),
-    getExperience: () => axios.get(`${API_BASE}/experience`).then(r => r.data),
-    getSkills: () => axios.get(`${API_BASE}/skills`).then(r => r.data),
+    getProjects: () => read('projects'),
+    getExperience: () => read('experience'),
+    getSkills: () => read('skills'),
     submitContact: (data: { name: string; email: string; message: string }) =>
         axios.post(`${API_BASE}/contact`, data).then(r => r.data),
-    chatbot: (query: string) =>
-        axios.post(`${API_BASE}/chatbot`, { query }).then(r => r.data),
+    chatbot: async (query: string) =>
+        (await snapshotAnswer(query)) ?? axios.post(`${API_BASE}/chatbot`, { query }).then(r => r.data),
+    /* Calls onEvent for each event as it arrives (axios buffers whole bodies, so fetch) */
+    chatbotStream: async (query: string, onEvent: (event: ChatEvent) => void, compose = false) => {
+        const known = compose ? null : await snapshotAnswer(query);
+        if (known) {
+            onEvent({ event: 'meta', section: known.section, intent: known.intent, confidence: known.confidence });
+            onEvent({ event: 'chunk', text: known.answer });
+            onEvent({ event: 'done' });
+            return;
+        }
+
+        const res = await fetch(`${API_BASE}/chatbot/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ query, compose }),
+        });
+        if (!res.ok || !res.body) throw new Error(`Chatbot stream failed: ${res.status}`);
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        for (;;) {
+            const { done, value } = await reader.read();
+            buffered += decoder.decode(value, { stream: !done });
+            const lines = buffered.split('\n');
+            buffered = lines.pop() ?? '';
+            for (const line of lines) {
+                if (line.trim()) onEvent(JSON.parse(line));
+            }
+            if (done) break;
+        }
+    },
     getAnalytics: () => axios.get(`${API_BASE}/analytics`).then(r => r.data),
-    recordVisit: () => axios.post(`${API_BASE}/analytics/visit`).then(r => r.data),
+    /* Recorded by the page-load bootstrap */
+    recordVisit: () => bootstrap().then(b => ({ total_visits: b.total_visits as number })),
 };
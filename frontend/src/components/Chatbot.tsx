@@ -53,15 +53,22 @@ export default function Chatbot() {
         setLoading(true);
         setShowChips(false);
 
+        /* Show the heading as soon as it arrives, then append the text as it streams */
+        const botId = Date.now() + 1;
+        const append = (piece: string) =>
+            setMessages(prev => prev.map(m => (m.id === botId ? { ...m, text: m.text + piece } : m)));
+
         try {
-            const res = await api.chatbot(q);
-            const botMsg: Message = {
-                id: Date.now() + 1,
-                role: 'bot',
-                text: res.answer,
-                section: res.section,
-            };
-            setMessages(prev => [...prev, botMsg]);
+            await api.chatbotStream(q, event => {
+                if (event.event === 'meta') {
+                    setLoading(false);
+                    setMessages(prev => [...prev, { id: botId, role: 'bot', text: '', section: event.section }]);
+                } else if (event.event === 'section') {
+                    append(`\n\n${event.section}\n`);
+                } else if (event.event === 'chunk') {
+                    append(event.text ?? '');
+                }
+            });
         } catch {
             setMessages(prev => [
                 ...prev,
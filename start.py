@@ -0,0 +1,89 @@
+"""
+start.py
+--------
+One-command launcher for the whole stack on Windows, macOS and Linux.
+
+    python start.py [--workers 2]
+
+Starts the API through backend/serve.py (prebuilt, shared model and content
+data) on port 8000 and the Vite dev server on port 5173, opens the
+portfolio in the browser, and stops both when you press Enter or Ctrl+C.
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import webbrowser
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_URL = "http://localhost:5173"
+
+
+def _spawn(cmd, cwd):
+    # Own process group, so stopping it also stops whatever it spawned (node, uvicorn workers)
+    if os.name == "nt":
+        return subprocess.Popen(cmd, cwd=cwd, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(cmd, cwd=cwd, start_new_session=True)
+
+
+def _stop(process):
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/PID", str(process.pid), "/T", "/F"], capture_output=True)
+    else:
+        os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start the portfolio backend and frontend.")
+    parser.add_argument("--workers", type=int, default=1, help="API worker processes")
+    parser.add_argument("--no-browser", action="store_true")
+    args = parser.parse_args()
+
+    npm = shutil.which("npm")
+    if npm is None:
+        sys.exit("npm was not found on PATH; install Node.js 18+ first.")
+
+    print("=" * 40)
+    print("  Starting Aviral Dubey Portfolio")
+    print("=" * 40)
+
+    print("[1/2] Starting Backend (port 8000)...")
+    backend = _spawn(
+        [sys.executable, "serve.py", "--workers", str(args.workers), "--port", "8000"],
+        os.path.join(ROOT, "backend"),
+    )
+    print("[2/2] Starting Frontend (port 5173)...")
+    frontend = _spawn([npm, "run", "dev"], os.path.join(ROOT, "frontend"))
+
+    time.sleep(3)
+    print()
+    print("=" * 40)
+    print("  Both servers are running!")
+    print(f"  Open: {FRONTEND_URL}")
+    print("=" * 40)
+    if not args.no_browser:
+        webbrowser.open(FRONTEND_URL)
+
+    try:
+        input("\nPress Enter to stop both servers...\n")
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        print("Stopping servers...")
+        _stop(frontend)
+        _stop(backend)
+        print("Done!")
+
+
+if __name__ == "__main__":
+    main()